@@ -0,0 +1,175 @@
+"""Benchmark the YAML to HTML converter on synthetic pages.
+
+Run from the repository root:
+
+    python -m benchmarks.converter --output results.json
+    python -m benchmarks.converter --baseline results.json --threshold 0.10
+
+Each case times three stages separately: loading the YAML with the loader
+the converter uses, rendering the body components with render_component,
+and the full yaml_to_html call. Peak memory is measured in a separate
+tracemalloc pass so it does not distort the timings, and the memory kept
+per node by the parsed dicts is compared with the normalized component tree.
+The tree is built from the dicts on every render and dropped with them, so
+this compares the two forms, not what a render keeps; peak memory is set by
+the parse either way.
+"""
+import argparse
+import json
+import platform
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from benchmarks.generators import GENERATORS, count_nodes, scaled, to_yaml
+from yaml_converter import YAML_LOADER, build_page_tree, render_component, yaml_to_html
+
+STAGES = ("safe_load", "render_component", "yaml_to_html")
+
+def time_call(function: Callable[[], Any], repeat: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def retained_memory(yaml_text: str) -> Dict[str, int]:
+    """Bytes held by the parsed dicts, then by the tree built from them once the dicts are dropped."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        data = yaml.load(yaml_text, Loader=YAML_LOADER)
+        as_dicts = tracemalloc.get_traced_memory()[0]
+        tree = build_page_tree(data)
+        del data
+        gc.collect()
+        as_tree = tracemalloc.get_traced_memory()[0]
+        del tree
+        return {"dicts": as_dicts, "tree": as_tree}
+    finally:
+        tracemalloc.stop()
+
+def render_body(data: Dict[str, Any]) -> str:
+    return "".join(render_component(child) for child in data["body"]["children"])
+
+def run_case(name: str, scale: float, repeat: int, warmup: int) -> Dict[str, Any]:
+    yaml_text = to_yaml(scaled(name, scale))
+    data = yaml.load(yaml_text, Loader=YAML_LOADER)
+    nodes = count_nodes(data)
+    html, success = yaml_to_html(yaml_text)
+    if not success:
+        raise RuntimeError(f"{name}: generated page failed to convert")
+    sizes = {
+        "safe_load": len(yaml_text.encode("utf-8")),
+        "render_component": len(render_body(data).encode("utf-8")),
+        "yaml_to_html": len(html.encode("utf-8")),
+    }
+    calls = {
+        "safe_load": lambda: yaml.load(yaml_text, Loader=YAML_LOADER),
+        "render_component": lambda: render_body(data),
+        "yaml_to_html": lambda: yaml_to_html(yaml_text),
+    }
+
+    stages = {}
+    for stage in STAGES:
+        samples = time_call(calls[stage], repeat, warmup)
+        median = statistics.median(samples)
+        stages[stage] = {
+            "median_s": median,
+            "min_s": min(samples),
+            "nodes_per_s": nodes / median if median else None,
+            "bytes_per_s": sizes[stage] / median if median else None,
+            "bytes": sizes[stage],
+            "peak_memory_bytes": peak_memory(calls[stage]),
+        }
+    retained = retained_memory(yaml_text)
+    return {"nodes": nodes, "yaml_bytes": sizes["safe_load"], "stages": stages,
+            "retained_bytes_per_node": {form: size / nodes for form, size in retained.items()}}
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Describe every stage whose median time grew by more than threshold."""
+    regressions = []
+    for name, case in results["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous is None or previous.get("nodes") != case["nodes"]:
+            continue
+        for stage, timing in case["stages"].items():
+            before = previous["stages"].get(stage, {}).get("median_s")
+            if before and timing["median_s"] > before * (1 + threshold):
+                regressions.append(f"{name}/{stage}: {before * 1000:.2f} ms -> "
+                                   f"{timing['median_s'] * 1000:.2f} ms "
+                                   f"(+{(timing['median_s'] / before - 1) * 100:.1f}%)")
+    return regressions
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'case':<16}{'stage':<18}{'median ms':>11}{'nodes/s':>12}{'MB/s':>9}{'peak MB':>9}")
+    for name, case in results["cases"].items():
+        for stage, timing in case["stages"].items():
+            print(f"{name:<16}{stage:<18}{timing['median_s'] * 1000:>11.2f}"
+                  f"{timing['nodes_per_s']:>12.0f}{timing['bytes_per_s'] / 1e6:>9.2f}"
+                  f"{timing['peak_memory_bytes'] / 1e6:>9.2f}")
+    print(f"\n{'case':<16}{'dict B/node':>12}{'tree B/node':>12}")
+    for name, case in results["cases"].items():
+        retained = case["retained_bytes_per_node"]
+        print(f"{name:<16}{retained['dicts']:>12.0f}{retained['tree']:>12.0f}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.converter",
+                                     description="Benchmark the YAML to HTML converter.")
+    parser.add_argument("cases", nargs="*", metavar="case",
+                        help=f"cases to run (default: all of {', '.join(GENERATORS)})")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every page size by this factor")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a JSON file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown against the baseline before failing (default 0.10)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in GENERATORS]
+    if unknown:
+        parser.error(f"unknown case: {', '.join(unknown)}")
+
+    results = {
+        "python": platform.python_version(),
+        "yaml_loader": YAML_LOADER.__name__,
+        "scale": args.scale,
+        "repeat": args.repeat,
+        "cases": {name: run_case(name, args.scale, args.repeat, args.warmup)
+                  for name in args.cases or GENERATORS},
+    }
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
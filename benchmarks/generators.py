@@ -0,0 +1,123 @@
+import yaml
+from typing import Any, Callable, Dict, List
+
+VARIANTS = ("primary", "secondary", "success", "danger")
+BUTTON_STYLES = ("solid", "outline", "ghost")
+SIZES = ("small", "medium", "large")
+LIST_TYPES = ("disc", "decimal", "square", "lower-roman")
+
+def page(title: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "title": title,
+        "body": {
+            "style": {"background-color": "#ffffff", "font-family": "Arial, sans-serif"},
+            "children": children,
+        },
+    }
+
+def deep_nesting(depth: int = 120) -> Dict[str, Any]:
+    """Alternating section/div containers nested depth levels deep."""
+    node: Dict[str, Any] = {"type": "paragraph", "text": "Innermost paragraph"}
+    for level in range(depth, 0, -1):
+        node = {
+            "type": "section" if level % 2 else "div",
+            "text": f"Level {level}",
+            "style": {"padding": "4px", "border-left": "1px solid #ccc"},
+            "children": [{"type": "paragraph", "text": f"Paragraph at level {level}"}, node],
+        }
+    return page("Deep nesting", [node])
+
+def wide_children(count: int = 5000) -> Dict[str, Any]:
+    """A flat body with count headers and paragraphs."""
+    children = []
+    for index in range(count):
+        if index % 5 == 0:
+            children.append({"type": "header", "text": f"Heading {index}",
+                             "style": {"color": "#333", "font-size": "24px"}})
+        else:
+            children.append({"type": "paragraph", "text": f"Paragraph {index} " + "lorem ipsum " * 8,
+                             "style": {"margin": "8px 0"}})
+    return page("Wide children", children)
+
+def button_grid(rows: int = 60, columns: int = 20) -> Dict[str, Any]:
+    """Rows of grid sections, each holding columns buttons of mixed variants."""
+    children = []
+    for row in range(rows):
+        buttons = []
+        for column in range(columns):
+            index = row * columns + column
+            buttons.append({
+                "type": "button",
+                "text": f"Button {index}",
+                "link": f"#target-{index}",
+                "variant": VARIANTS[index % len(VARIANTS)],
+                "button-style": BUTTON_STYLES[index % len(BUTTON_STYLES)],
+                "size": SIZES[index % len(SIZES)],
+            })
+        children.append({
+            "type": "section",
+            "style": {"display": "grid", "grid-template-columns": f"repeat({columns}, 1fr)", "gap": "8px"},
+            "children": buttons,
+        })
+    return page("Button grid", children)
+
+def image_gallery(count: int = 2000) -> Dict[str, Any]:
+    """Gallery divs of remote images, so no local path lookups are timed."""
+    galleries = []
+    for start in range(0, count, 50):
+        galleries.append({
+            "type": "div",
+            "style": {"display": "flex", "flex-wrap": "wrap", "gap": "10px"},
+            "children": [{
+                "type": "image",
+                "src": f"https://images.example.com/gallery/{index}.jpg",
+                "alt": f"Gallery image {index}",
+                "style": {"width": "200px", "height": "150px", "object-fit": "cover"},
+            } for index in range(start, min(start + 50, count))],
+        })
+    return page("Image gallery", galleries)
+
+def long_lists(lists: int = 20, items: int = 1000) -> Dict[str, Any]:
+    """Lists of plain and key/value items."""
+    children = []
+    for number in range(lists):
+        entries: List[Any] = []
+        for index in range(items):
+            if index % 4 == 0:
+                entries.append({f"Term {index}": f"Definition of term {index}"})
+            else:
+                entries.append(f"List {number} item {index}")
+        children.append({
+            "type": "list",
+            "list-type": LIST_TYPES[number % len(LIST_TYPES)],
+            "style": {"padding-left": "20px"},
+            "items": entries,
+        })
+    return page("Long lists", children)
+
+GENERATORS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "deep_nesting": deep_nesting,
+    "wide_children": wide_children,
+    "button_grid": button_grid,
+    "image_gallery": image_gallery,
+    "long_lists": long_lists,
+}
+
+def scaled(name: str, scale: float) -> Dict[str, Any]:
+    """Build a generator's page with every size argument multiplied by scale."""
+    generator = GENERATORS[name]
+    defaults = generator.__defaults__ or ()
+    return generator(*(max(1, int(value * scale)) for value in defaults))
+
+def to_yaml(data: Dict[str, Any]) -> str:
+    return yaml.safe_dump(data, sort_keys=False, allow_unicode=True, width=1000)
+
+def count_nodes(component: Any) -> int:
+    """Number of components and list items in a parsed page or component."""
+    if isinstance(component, dict):
+        if "body" in component:
+            return count_nodes(component["body"].get("children", []))
+        return 1 + len(component.get("items", [])) + count_nodes(component.get("children", []))
+    if isinstance(component, list):
+        return sum(count_nodes(child) for child in component)
+    return 0
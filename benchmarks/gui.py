@@ -0,0 +1,276 @@
+"""Measure editor responsiveness by typing into an offscreen WebForge window.
+
+Run from the repository root; no display is needed:
+
+    python -m benchmarks.gui --output gui.json
+
+The harness posts key events to the active YAMLEditor through the event
+loop, the same way real input arrives, and records per scenario:
+
+- input_to_paint: from posting a key press to the end of the editor
+  viewport's next paint
+- highlight_block: time spent in YAMLHighlighter.highlightBlock per call
+- update_preview: from update_preview being called to the preview's
+  loadFinished signal
+- event_loop_stall: how late a 5 ms timer fired, beyond its interval
+
+QT_QPA_PLATFORM defaults to "offscreen". On a build box running as root
+QtWebEngine may additionally need QTWEBENGINE_DISABLE_SANDBOX=1.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QEvent, QEventLoop, QObject, QSettings, QStandardPaths, Qt, QTimer
+from PyQt5.QtGui import QKeyEvent
+from PyQt5.QtWidgets import QApplication
+
+import main as webforge
+from benchmarks.generators import to_yaml, wide_children
+from render_service import percentile
+
+STALL_INTERVAL_MS = 5
+TYPED_TEXT = "the quick brown fox jumps over the lazy dog "
+
+class Scenario:
+    def __init__(self, name: str, page: Callable[["Harness"], str], chars: int,
+                 interval_ms: int, pause_every: int):
+        self.name = name
+        self.page = page
+        self.chars = chars
+        self.interval_ms = interval_ms
+        self.pause_every = pause_every
+
+def example_page(harness: "Harness") -> str:
+    harness.window.load_example_yaml()
+    return harness.window.yaml_editor.toPlainText()
+
+def large_page(harness: "Harness") -> str:
+    return to_yaml(wide_children(max(1, int(2000 * harness.scale))))
+
+SCENARIOS = {
+    # Steady typing with a pause long enough for the preview to refresh
+    "example_typing": Scenario("example_typing", example_page, 200, 30, 40),
+    "large_typing": Scenario("large_typing", large_page, 200, 30, 40),
+    # Key presses posted back to back, as fast as the editor accepts them
+    "large_burst": Scenario("large_burst", large_page, 400, 0, 0),
+}
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"count": len(samples)}
+    for label, fraction in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+        value = percentile(samples, fraction)
+        summary[f"{label}_ms"] = round(value * 1000, 3) if value is not None else None
+    summary["max_ms"] = round(max(samples) * 1000, 3) if samples else None
+    return summary
+
+def key_for(char: str) -> int:
+    if char == " ":
+        return Qt.Key_Space
+    return Qt.Key_A + ord(char.upper()) - ord("A")
+
+class Harness(QObject):
+    def __init__(self, app: QApplication, scale: float = 1.0, timeout: float = 10.0):
+        super().__init__()
+        self.app = app
+        self.scale = scale
+        self.timeout = timeout
+        self.samples: Dict[str, List[float]] = {}
+        self.key_posted: Optional[float] = None
+        self.preview_started: Optional[float] = None
+        self.painting = False
+
+        # Wrapped on the classes before the window exists, so the timer
+        # connections made in its constructor pick up the timed versions.
+        highlight_block = webforge.YAMLHighlighter.highlightBlock
+        update_preview = webforge.YAMLPreviewApp.update_preview
+        harness = self
+
+        def timed_highlight_block(highlighter, text):
+            start = time.perf_counter()
+            highlight_block(highlighter, text)
+            harness.record("highlight_block", time.perf_counter() - start)
+
+        def timed_update_preview(window):
+            harness.preview_started = time.perf_counter()
+            update_preview(window)
+
+        webforge.YAMLHighlighter.highlightBlock = timed_highlight_block
+        webforge.YAMLPreviewApp.update_preview = timed_update_preview
+
+        self.window = webforge.YAMLPreviewApp()
+        self.window.recovery_offered = True
+        # The options that change what a keystroke costs are pinned to their
+        # defaults, wherever the settings they were read from live
+        self.window.validation_enabled = True
+        self.window.scroll_sync_enabled = True
+        self.window.fsync_mode = "file"
+        self.window.render_profiling = False
+        self.window.show()
+        self.wait_until(lambda: self.window.preview_area is not None)
+        self.window.preview_area.loadFinished.connect(self.on_preview_loaded)
+
+        self.stall_timer = QTimer(self)
+        self.stall_timer.setTimerType(Qt.PreciseTimer)
+        self.stall_timer.setInterval(STALL_INTERVAL_MS)
+        self.stall_timer.timeout.connect(self.on_stall_tick)
+        self.last_tick = time.perf_counter()
+
+    def record(self, metric: str, seconds: float) -> None:
+        self.samples.setdefault(metric, []).append(seconds)
+
+    def eventFilter(self, watched, event):
+        if event.type() != QEvent.Paint or self.painting:
+            return False
+        # Deliver the paint ourselves so the sample covers the whole paint
+        self.painting = True
+        try:
+            QCoreApplication.sendEvent(watched, event)
+        finally:
+            self.painting = False
+        if self.key_posted is not None:
+            self.record("input_to_paint", time.perf_counter() - self.key_posted)
+            self.key_posted = None
+        return True
+
+    def on_stall_tick(self) -> None:
+        now = time.perf_counter()
+        self.record("event_loop_stall", max(0.0, now - self.last_tick - STALL_INTERVAL_MS / 1000))
+        self.last_tick = now
+
+    def on_preview_loaded(self, ok: bool) -> None:
+        if self.preview_started is not None:
+            self.record("update_preview", time.perf_counter() - self.preview_started)
+            self.preview_started = None
+
+    def wait_until(self, predicate: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        deadline = time.perf_counter() + (self.timeout if timeout is None else timeout)
+        while not predicate():
+            if time.perf_counter() > deadline:
+                return False
+            self.app.processEvents(QEventLoop.AllEvents, 10)
+            time.sleep(0.001)
+        return True
+
+    def wait_for_preview(self) -> None:
+        window = self.window
+        self.wait_until(lambda: not window.preview_timer.isActive() and self.preview_started is None)
+
+    def type_char(self, editor, char: str) -> None:
+        key = key_for(char)
+        self.key_posted = time.perf_counter()
+        QApplication.postEvent(editor, QKeyEvent(QEvent.KeyPress, key, Qt.NoModifier, char))
+        QApplication.postEvent(editor, QKeyEvent(QEvent.KeyRelease, key, Qt.NoModifier, char))
+
+    def place_cursor(self, editor) -> None:
+        # Type into the last text: value, inside its quotes if it has them
+        block = editor.document().lastBlock()
+        while block.isValid() and not block.text().lstrip().startswith("text:"):
+            block = block.previous()
+        if not block.isValid():
+            block = editor.document().lastBlock()
+        column = len(block.text().rstrip())
+        if block.text().rstrip().endswith(('"', "'")):
+            column -= 1
+        cursor = editor.textCursor()
+        cursor.setPosition(block.position() + column)
+        editor.setTextCursor(cursor)
+        editor.ensureCursorVisible()
+
+    def run(self, scenario: Scenario) -> Dict[str, Any]:
+        window = self.window
+        text = scenario.page(self)
+        editor = window.yaml_editor
+        if editor.toPlainText() != text:
+            editor.setPlainText(text)
+        self.wait_for_preview()
+        self.place_cursor(editor)
+        self.wait_until(lambda: False, 0.2)
+
+        self.samples = {}
+        editor.viewport().installEventFilter(self)
+        self.last_tick = time.perf_counter()
+        self.stall_timer.start()
+        try:
+            for index in range(scenario.chars):
+                self.type_char(editor, TYPED_TEXT[index % len(TYPED_TEXT)])
+                started = self.key_posted
+                self.wait_until(lambda: self.key_posted is None, 1.0)
+                if scenario.interval_ms:
+                    self.wait_until(lambda: time.perf_counter() - started >= scenario.interval_ms / 1000)
+                if scenario.pause_every and (index + 1) % scenario.pause_every == 0:
+                    self.wait_until(lambda: window.preview_timer.isActive() or self.preview_started is not None, 1.0)
+                    self.wait_for_preview()
+            self.wait_for_preview()
+        finally:
+            self.stall_timer.stop()
+            editor.viewport().removeEventFilter(self)
+
+        editor.document().setModified(False)
+        return {
+            "document_bytes": len(text.encode("utf-8")),
+            "blocks": editor.document().blockCount(),
+            "chars_typed": scenario.chars,
+            "interval_ms": scenario.interval_ms,
+            "metrics": {metric: summarize(self.samples.get(metric, []))
+                        for metric in ("input_to_paint", "highlight_block", "update_preview", "event_loop_stall")},
+        }
+
+    def close(self) -> None:
+        for tab in self.window.document_tabs():
+            tab.editor.document().setModified(False)
+        self.window.close()
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'scenario':<16}{'metric':<18}{'count':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, scenario in results["scenarios"].items():
+        for metric, summary in scenario["metrics"].items():
+            values = [f"{summary[key]:>9.2f}" if summary[key] is not None else f"{'-':>9}"
+                      for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")]
+            print(f"{name:<16}{metric:<18}{summary['count']:>7}{''.join(values)}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.gui",
+                                     description="Benchmark editor and preview responsiveness offscreen.")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--scale", type=float, default=1.0, help="resize the large page by this factor")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    # Keep recovery journals away from the user's own, and read and write
+    # settings in a scratch directory. setPath cannot move the Windows
+    # registry, which is why Harness also pins the options it depends on.
+    QStandardPaths.setTestModeEnabled(True)
+    settings_directory = tempfile.TemporaryDirectory(prefix="webforge-gui-bench-")
+    for settings_format in (QSettings.NativeFormat, QSettings.IniFormat):
+        QSettings.setPath(settings_format, QSettings.UserScope, settings_directory.name)
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv[:1])
+    harness = Harness(app, args.scale)
+    try:
+        results = {
+            "platform": app.platformName(),
+            "scale": args.scale,
+            "scenarios": {name: harness.run(SCENARIOS[name]) for name in args.scenarios or SCENARIOS},
+        }
+    finally:
+        harness.close()
+        settings_directory.cleanup()
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,340 @@
 import sys
 import os
 import re
-import markdown
+import json
+import time
+import mmap
+import codecs
+import hashlib
+from collections import OrderedDict, deque
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+def run_command(argv):
+    # The service and lint modes need neither Qt nor the GUI, so they are
+    # dispatched before PyQt5 is imported and work where it is not installed
+    if argv[1:2] == ["serve"]:
+        from render_service import main as serve
+        serve(argv[2:])
+        sys.exit(0)
+    if argv[1:2] == ["lint"]:
+        from yaml_schema import main as lint
+        sys.exit(lint(argv[2:]))
+
+if __name__ == "__main__":
+    run_command(sys.argv)
+
+STARTUP_BEGIN = time.perf_counter()
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QPlainTextEdit, QPushButton, QFileDialog,
                             QMessageBox, QSplitter, QAction,
-                            QToolBar, QDialog, QTextEdit, QLabel, QLineEdit, QMenu, QToolButton)
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtWebChannel import QWebChannel
-from PyQt5.QtCore import Qt, QTimer, QUrl, QSize, QObject, pyqtSlot, QRect
-from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QIcon, QPainter
-from yaml_converter import yaml_to_html
+                            QToolBar, QDialog, QTextEdit, QLabel, QLineEdit, QMenu, QToolButton,
+                            QCheckBox, QDockWidget, QTreeView, QProgressBar, QActionGroup,
+                            QTabWidget, QToolTip)
+from PyQt5.QtCore import (Qt, QTimer, QUrl, QSize, QObject, pyqtSlot, QRect, QPoint, QSettings, QEvent,
+                          QAbstractItemModel, QModelIndex, QCoreApplication, pyqtSignal,
+                          QLockFile, QStandardPaths)
+from PyQt5.QtGui import (QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QIcon, QPainter,
+                         QTextCursor, QPolygon, QTextDocument)
+import yaml
+from yaml_converter import (yaml_to_html, parse_yaml, build_outline, build_page_tree, render_page,
+                            render_error_page)
+from render_profile import RenderProfile, phase, write_chrome_trace
+import render_hooks
+from yaml_schema import SchemaValidator, syntax_diagnostic
+from source_map import SourceMap
+
+ASTRAL_CHARS = re.compile('[\U00010000-\U0010FFFF]')
+FOLD_MARKER_WIDTH = 14
+DIAGNOSTIC_MARKER_WIDTH = 8
+DIAGNOSTIC_COLORS = {"error": "#ff6b6b", "warning": "#ffa94d"}
+FILE_LOAD_CHUNK_SIZE = 64 * 1024
+RENDER_PROFILE_HISTORY = 50
+# One display frame; the page itself applies scroll targets on animation frames
+SCROLL_SYNC_INTERVAL_MS = 16
+PREVIEW_CACHE_MB = 256
+FSYNC_MODES = [
+    ("none", "Fast (no fsync)"),
+    ("file", "Flush file to disk"),
+    ("directory", "Flush file and directory"),
+]
+
+class StartupProfile:
+    def __init__(self):
+        self.enabled = False
+        self.last = STARTUP_BEGIN
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        print(f"[startup] {phase:<24} {(now - self.last) * 1000:8.1f} ms"
+              f"  (total {(now - STARTUP_BEGIN) * 1000:.1f} ms)", file=sys.stderr)
+        self.last = now
+
+startup_profile = StartupProfile()
+
+def current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+# Read once at startup: os.umask can only be read by setting it, which would
+# race with files being created on other threads
+UMASK = current_umask()
+
+def write_file_atomic(path, content, fsync_mode="file"):
+    # The content goes to a temporary file next to the target, which is then
+    # renamed over it, so a crash mid-write leaves the old file untouched. A
+    # symlink is followed, so the file it points at is replaced, not the link.
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(content)
+            if fsync_mode != "none":
+                file.flush()
+                os.fsync(file.fileno())
+        # mkstemp creates the file owner-only; new files get the usual mode
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        else:
+            os.chmod(temp_path, 0o666 & ~UMASK)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    if fsync_mode == "directory" and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def render_document(yaml_text, profile=None, publish=False):
+    # The preview's page carries source ids and the script that uses them;
+    # with publish, a plain copy for external browsers is rendered as well,
+    # paired with the local image URLs the server may expose for it.
+    if profile is not None:
+        profile.add_phase("queue", profile.origin, time.perf_counter())
+    hooked = render_hooks.start_document(yaml_text, profile)
+    if hooked is not None:
+        profile = hooked
+    try:
+        try:
+            with phase(profile, "parse"):
+                data, root_node = parse_yaml(yaml_text)
+        except yaml.YAMLError as e:
+            html_content = render_error_page(e)
+            published = (html_content, ()) if publish else None
+            result = html_content, False, None, None, published, [syntax_diagnostic(e)]
+        else:
+            # An empty document is left to render_page, which shows the welcome page
+            tree = data
+            if data:
+                with phase(profile, "normalize"):
+                    tree = build_page_tree(data, profile)
+            html_content = render_page(tree, profile=profile, source_ids=True)
+            published = None
+            if publish:
+                with phase(profile, "publish"):
+                    published = (render_page(tree), tree.assets if data else ())
+            with phase(profile, "outline"):
+                outline = build_outline(root_node)
+                source_map = SourceMap(outline)
+            result = html_content, True, outline, source_map, published, []
+    except BaseException:
+        if hooked is not None:
+            hooked.finish(False, "")
+        raise
+    if hooked is not None:
+        hooked.finish(result[1], result[0])
+    return result
+
+class RecoveryJournal:
+    # Append-only log of unsaved edits for crash recovery. The first line is
+    # a base record: either a reference to the file as saved (path and hash)
+    # or, after compaction or for untitled documents, the full text along
+    # with the hash of the saved content, if there is any. Every
+    # further line is one [position, removed, inserted] delta taken from
+    # contentsChange. Positions are QTextDocument positions, so the deltas are
+    # replayed on a QTextDocument rather than on a Python string.
+    COMPACT_BYTES = 1024 * 1024
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"session-{os.getpid()}-{uuid.uuid4().hex[:8]}.journal")
+        self.lock = QLockFile(self.path + ".lock")
+        self.lock.tryLock(0)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = []
+        self.bytes_logged = 0
+
+    def reset(self, file_path, content_hash=None, text=None):
+        self.pending = []
+        self.bytes_logged = 0
+        base = {
+            "file": file_path,
+            "sha1": content_hash.hex() if content_hash is not None else None,
+            "text": text,
+            "time": time.time(),
+        }
+        self.executor.submit(write_file_atomic, self.path, json.dumps(base) + "\n", "none")
+
+    def record(self, position, removed, text):
+        self.pending.append(json.dumps([position, removed, text]) + "\n")
+
+    def flush(self):
+        if not self.pending:
+            return
+        data = "".join(self.pending)
+        self.pending = []
+        self.bytes_logged += len(data)
+        self.executor.submit(self.append, data)
+
+    def append(self, data):
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(data)
+
+    def needs_compaction(self):
+        return self.bytes_logged > self.COMPACT_BYTES
+
+    def close(self):
+        self.pending = []
+        self.executor.shutdown()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.lock.unlock()
+
+    @staticmethod
+    def orphans(directory):
+        # A journal whose lock can be taken belongs to a session that is no
+        # longer running. The stale time is disabled so only a dead owner
+        # frees a lock, not its age.
+        if not os.path.isdir(directory):
+            return
+        for name in sorted(os.listdir(directory), reverse=True):
+            if not name.endswith(".journal"):
+                continue
+            path = os.path.join(directory, name)
+            lock = QLockFile(path + ".lock")
+            lock.setStaleLockTime(0)
+            if lock.tryLock(0):
+                yield path, lock
+
+    @staticmethod
+    def recover(path):
+        with open(path, 'r', encoding='utf-8', newline='') as file:
+            lines = file.read().split("\n")
+        base = json.loads(lines[0])
+        edits = [line for line in lines[1:] if line]
+        text = base["text"]
+        if text is None:
+            if not edits:
+                return None
+            text = ""
+            if base["file"]:
+                with open(base["file"], 'r', encoding='utf-8') as file:
+                    text = file.read()
+            if hashlib.sha1(text.encode('utf-8')).hexdigest() != base["sha1"]:
+                return None
+        
+        document = QTextDocument()
+        document.setPlainText(text)
+        cursor = QTextCursor(document)
+        for line in edits:
+            try:
+                position, removed, inserted = json.loads(line)
+            except ValueError:
+                break
+            end = document.characterCount() - 1
+            cursor.setPosition(min(position, end))
+            cursor.setPosition(min(position + removed, end), QTextCursor.KeepAnchor)
+            cursor.insertText(inserted)
+        text = document.toPlainText()
+        # Edits that end where the document was last saved leave nothing to recover
+        if hashlib.sha1(text.encode('utf-8')).hexdigest() == base["sha1"]:
+            return None
+        return base["file"], text
+
+class YAMLOutline:
+    # Indentation outline of the document, one entry per block (-1 for blank
+    # and comment lines). It is patched from contentsChange deltas so only the
+    # edited lines are rescanned; fold regions are derived from it on demand.
+    def __init__(self, document):
+        self.document = document
+        self.indents = []
+        self.block_count = 0
+        self.update(0, 0, document.characterCount())
+
+    def block_indent(self, text):
+        stripped = text.lstrip(' ')
+        if not stripped or stripped.startswith('#'):
+            return -1
+        return len(text) - len(stripped)
+
+    def update(self, position, chars_removed, chars_added):
+        first = self.document.findBlock(position).blockNumber()
+        last = self.document.findBlock(position + chars_added).blockNumber()
+        if last < first:
+            last = self.document.blockCount() - 1
+        delta = self.document.blockCount() - self.block_count
+        old_last = min(last - delta, len(self.indents) - 1)
+
+        indents = []
+        block = self.document.findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            indents.append(self.block_indent(block.text()))
+            block = block.next()
+
+        self.indents[first:old_last + 1] = indents
+        self.block_count = self.document.blockCount()
+        return first, old_last, delta
+
+    def fold_end(self, line):
+        if line >= len(self.indents) or self.indents[line] < 0:
+            return None
+        indent = self.indents[line]
+        end = line
+        for number in range(line + 1, len(self.indents)):
+            child_indent = self.indents[number]
+            if child_indent < 0:
+                continue
+            if child_indent <= indent:
+                break
+            end = number
+        return end if end > line else None
+
+    def is_foldable(self, line):
+        if line >= len(self.indents) or self.indents[line] < 0:
+            return False
+        for number in range(line + 1, len(self.indents)):
+            if self.indents[number] >= 0:
+                return self.indents[number] > self.indents[line]
+        return False
+
+    def enclosing_fold(self, line):
+        if self.is_foldable(line):
+            return line
+        indent = self.indents[line] if line < len(self.indents) else -1
+        for number in range(line - 1, -1, -1):
+            parent_indent = self.indents[number]
+            if parent_indent < 0:
+                continue
+            if indent < 0 or parent_indent < indent:
+                end = self.fold_end(number)
+                if end is not None and end >= line:
+                    return number
+                indent = parent_indent
+        return None
 
 class LineNumberWidget(QWidget):
     def __init__(self, editor):
@@ -35,29 +359,86 @@ class LineNumberWidget(QWidget):
         while max_num >= 10:
             max_num //= 10
             digits += 1
-        space = 3 + self.fontMetrics().horizontalAdvance('9') * digits
+        space = DIAGNOSTIC_MARKER_WIDTH + 3 + self.fontMetrics().horizontalAdvance('9') * digits + FOLD_MARKER_WIDTH
         return space
     
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.fillRect(event.rect(), QColor("#21262d"))
         
+        document = self.editor.document()
         block = self.editor.firstVisibleBlock()
         block_number = block.blockNumber()
         top = self.editor.blockBoundingGeometry(block).translated(self.editor.contentOffset()).top()
         bottom = top + self.editor.blockBoundingRect(block).height()
+        line_height = self.editor.fontMetrics().height()
+        severities = self.editor.diagnostic_severities()
         
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
+                severity = severities.get(block_number)
+                if severity is not None:
+                    self.paint_diagnostic_marker(painter, int(top), line_height, severity)
+                
                 number = str(block_number + 1)
                 painter.setPen(QColor("#7d8590"))
-                rect = QRect(0, int(top), self.width(), self.editor.fontMetrics().height())
+                rect = QRect(0, int(top), self.width() - FOLD_MARKER_WIDTH, line_height)
                 painter.drawText(rect, Qt.AlignRight, number)
+                
+                if self.editor.outline.is_foldable(block_number):
+                    self.paint_fold_marker(painter, int(top), line_height,
+                                           block_number in self.editor.folds)
             
-            block = block.next()
+            fold_end = self.editor.folds.get(block_number)
+            if fold_end is not None:
+                # Folded blocks are hidden; jump straight past them instead of
+                # walking every hidden block.
+                block = document.findBlockByNumber(fold_end + 1)
+                block_number = fold_end + 1
+            else:
+                block = block.next()
+                block_number += 1
             top = bottom
             bottom = top + self.editor.blockBoundingRect(block).height()
-            block_number += 1
+    
+    def paint_fold_marker(self, painter, top, line_height, folded):
+        size = 8
+        left = self.width() - FOLD_MARKER_WIDTH + (FOLD_MARKER_WIDTH - size) // 2
+        middle = top + line_height // 2
+        if folded:
+            points = [QPoint(left, middle - size // 2), QPoint(left + size, middle),
+                      QPoint(left, middle + size // 2)]
+        else:
+            points = [QPoint(left, middle - size // 4), QPoint(left + size, middle - size // 4),
+                      QPoint(left + size // 2, middle + size // 2)]
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#4dabf7") if folded else QColor("#7d8590"))
+        painter.drawPolygon(QPolygon(points))
+    
+    def paint_diagnostic_marker(self, painter, top, line_height, severity):
+        size = 6
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(DIAGNOSTIC_COLORS[severity]))
+        painter.drawEllipse((DIAGNOSTIC_MARKER_WIDTH - size) // 2 + 1, top + (line_height - size) // 2, size, size)
+    
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            block = self.editor.cursorForPosition(QPoint(0, event.pos().y())).block()
+            messages = self.editor.diagnostic_messages(block.blockNumber())
+            if messages:
+                QToolTip.showText(event.globalPos(), "\n".join(messages), self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and event.x() >= self.width() - FOLD_MARKER_WIDTH:
+            block = self.editor.cursorForPosition(QPoint(0, event.y())).block()
+            if block.isValid():
+                self.editor.toggle_fold(block.blockNumber())
+                return
+        super().mousePressEvent(event)
 
 class YAMLHighlighter(QSyntaxHighlighter):
     def __init__(self, parent=None):
@@ -97,10 +478,13 @@ class YAMLHighlighter(QSyntaxHighlighter):
         list_item_format = QTextCharFormat()
         list_item_format.setForeground(QColor("#bdc3c7"))
         self.highlighting_rules.append((r'^\s*-\s*', list_item_format))
+        self.highlighting_rules = [(re.compile(pattern), format) for pattern, format in self.highlighting_rules]
 
     def highlightBlock(self, text):
+        if not self.currentBlock().isVisible():
+            return
         for pattern, format in self.highlighting_rules:
-            for match in re.finditer(pattern, text):
+            for match in pattern.finditer(text):
                 start = match.start()
                 length = match.end() - start
                 self.setFormat(start, length, format)
@@ -128,6 +512,12 @@ class YAMLEditor(QPlainTextEdit):
         """)
         
         self.highlighter = YAMLHighlighter(self.document())
+        self.outline = YAMLOutline(self.document())
+        self.folds = {}
+        self.diagnostics = []
+        self.diagnostic_selections = []
+        self.current_line_selection = None
+        self.document().contentsChange.connect(self.on_contents_change)
         
         self.line_number_widget = LineNumberWidget(self)
         self.blockCountChanged.connect(self.update_line_number_width)
@@ -147,7 +537,7 @@ class YAMLEditor(QPlainTextEdit):
         while max_num >= 10:
             max_num //= 10
             digits += 1
-        space = 3 + self.fontMetrics().horizontalAdvance('9') * digits
+        space = DIAGNOSTIC_MARKER_WIDTH + 3 + self.fontMetrics().horizontalAdvance('9') * digits + FOLD_MARKER_WIDTH
         return space
     
     def update_line_number_width(self, new_block_count):
@@ -168,7 +558,7 @@ class YAMLEditor(QPlainTextEdit):
         self.line_number_widget.setGeometry(cr.left(), cr.top(), self.line_number_width(), cr.height())
     
     def highlight_current_line(self):
-        extra_selections = []
+        self.current_line_selection = None
         if not self.isReadOnly():
             selection = QTextEdit.ExtraSelection()
             line_color = QColor("#21262d")
@@ -176,8 +566,72 @@ class YAMLEditor(QPlainTextEdit):
             selection.format.setProperty(QTextCharFormat.FullWidthSelection, True)
             selection.cursor = self.textCursor()
             selection.cursor.clearSelection()
-            extra_selections.append(selection)
-        self.setExtraSelections(extra_selections)
+            self.current_line_selection = selection
+        self.update_extra_selections()
+
+    def update_extra_selections(self):
+        extra_selections = [self.current_line_selection] if self.current_line_selection is not None else []
+        self.setExtraSelections(extra_selections + self.diagnostic_selections)
+
+    def set_diagnostics(self, diagnostics):
+        # The selections' cursors move with later edits, so squiggles stay on
+        # the text they were reported for until the next validation arrives.
+        document = self.document()
+        self.diagnostics = []
+        self.diagnostic_selections = []
+        for diagnostic in diagnostics:
+            block = document.findBlockByNumber(diagnostic.line)
+            if not block.isValid():
+                block = document.lastBlock()
+            end_block = document.findBlockByNumber(diagnostic.end_line)
+            if not end_block.isValid():
+                end_block = block
+            start = block.position() + self.utf16_column(block, diagnostic.column)
+            end = end_block.position() + self.utf16_column(end_block, diagnostic.end_column)
+            block_end = block.position() + max(0, block.length() - 1)
+            start = min(start, max(block.position(), block_end - 1))
+            end = max(min(end, block_end), min(start + 1, block_end))
+            
+            selection = QTextEdit.ExtraSelection()
+            selection.format.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
+            selection.format.setUnderlineColor(QColor(DIAGNOSTIC_COLORS[diagnostic.severity]))
+            selection.cursor = QTextCursor(document)
+            selection.cursor.setPosition(start)
+            selection.cursor.setPosition(end, QTextCursor.KeepAnchor)
+            self.diagnostics.append(diagnostic)
+            self.diagnostic_selections.append(selection)
+        self.update_extra_selections()
+        self.line_number_widget.update()
+
+    def utf16_column(self, block, column):
+        text = block.text()[:column]
+        return len(text) + len(ASTRAL_CHARS.findall(text))
+
+    def diagnostic_severities(self):
+        severities = {}
+        for diagnostic, selection in zip(self.diagnostics, self.diagnostic_selections):
+            line = selection.cursor.block().blockNumber()
+            if severities.get(line) != "error":
+                severities[line] = diagnostic.severity
+        return severities
+
+    def diagnostic_messages(self, line):
+        return [f"{diagnostic.severity.capitalize()}: {diagnostic.message}"
+                for diagnostic, selection in zip(self.diagnostics, self.diagnostic_selections)
+                if selection.cursor.block().blockNumber() == line]
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip:
+            position = self.cursorForPosition(event.pos()).position()
+            messages = [f"{diagnostic.severity.capitalize()}: {diagnostic.message}"
+                        for diagnostic, selection in zip(self.diagnostics, self.diagnostic_selections)
+                        if selection.cursor.selectionStart() <= position <= selection.cursor.selectionEnd()]
+            if messages:
+                QToolTip.showText(event.globalPos(), "\n".join(messages), self.viewport())
+            else:
+                QToolTip.hideText()
+            return True
+        return super().viewportEvent(event)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_W and event.modifiers() == (Qt.ControlModifier | Qt.ShiftModifier):
@@ -188,7 +642,17 @@ class YAMLEditor(QPlainTextEdit):
             self.wrap_selection_with_component("section")
             return
             
-        elif event.key() == Qt.Key_Tab:
+        elif event.key() in (Qt.Key_BracketLeft, Qt.Key_BraceLeft) and event.modifiers() == (Qt.ControlModifier | Qt.ShiftModifier):
+            self.fold_at_cursor()
+            return
+            
+        elif event.key() in (Qt.Key_BracketRight, Qt.Key_BraceRight) and event.modifiers() == (Qt.ControlModifier | Qt.ShiftModifier):
+            self.unfold_at_cursor()
+            return
+            
+        # Edits made through a QTextCursor ignore read-only mode, so while a
+        # file is loading the editing keys are left to QPlainTextEdit
+        elif event.key() == Qt.Key_Tab and not self.isReadOnly():
             cursor = self.textCursor()
             if cursor.hasSelection():
                 self.indent_selection()
@@ -201,7 +665,7 @@ class YAMLEditor(QPlainTextEdit):
             cursor.insertText("  ")
             return
             
-        elif event.key() == Qt.Key_Backtab:
+        elif event.key() == Qt.Key_Backtab and not self.isReadOnly():
             cursor = self.textCursor()
             if cursor.hasSelection():
                 self.unindent_selection()
@@ -210,7 +674,7 @@ class YAMLEditor(QPlainTextEdit):
                 self.unindent_current_line()
                 return
             
-        elif event.key() == Qt.Key_Return:
+        elif event.key() == Qt.Key_Return and not self.isReadOnly():
             cursor = self.textCursor()
             current_line = cursor.block().text()
             current_indent = len(current_line) - len(current_line.lstrip())
@@ -226,73 +690,92 @@ class YAMLEditor(QPlainTextEdit):
         super().keyPressEvent(event)
     
     def wrap_selection_with_component(self, component_type):
+        if self.isReadOnly():
+            return
         cursor = self.textCursor()
         if not cursor.hasSelection():
             QMessageBox.information(self, "No Selection", 
                                   "Please select the YAML content you want to wrap first.")
             return
         
-        selected_text = cursor.selectedText()
-        lines = selected_text.split('\n')
+        first, last = self.selected_line_range()
+        lines = self.line_texts(first, last)
+        content_lines = [line for line in lines if line.strip()]
+        if not content_lines:
+            return
         
-        first_line_indent = len(lines[0]) - len(lines[0].lstrip())
+        first_line_indent = len(content_lines[0]) - len(content_lines[0].lstrip())
         indent_str = " " * first_line_indent
         
-        wrapper = f"{indent_str}- type: {component_type}\n"
-        wrapper += f"{indent_str}  children:\n"
+        wrapper = [f"{indent_str}- type: {component_type}", f"{indent_str}  children:"]
+        for line in content_lines:
+            line_indent = len(line) - len(line.lstrip())
+            wrapper.append(f"{indent_str}    {line[min(line_indent, first_line_indent):]}")
         
-        for line in lines:
-            if line.strip():
-                wrapper += f"{indent_str}    {line.strip()}\n"
-        
-        cursor.insertText(wrapper)
+        self.replace_lines(first, last, wrapper)
     
-    def indent_selection(self):
+    def selected_line_range(self):
         cursor = self.textCursor()
-        if not cursor.hasSelection():
+        document = self.document()
+        first = document.findBlock(cursor.selectionStart()).blockNumber()
+        last = document.findBlock(cursor.selectionEnd()).blockNumber()
+        return first, last
+    
+    def line_texts(self, first, last):
+        lines = []
+        block = self.document().findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            lines.append(block.text())
+            block = block.next()
+        return lines
+    
+    def replace_lines(self, first, last, lines):
+        # Swaps whole lines with a single insertion inside one edit block, so a
+        # bulk edit is one undo step and the highlighter, textChanged and the
+        # preview timer each see exactly one change for the whole range.
+        if self.isReadOnly():
             return
+        document = self.document()
+        start = document.findBlockByNumber(first).position()
+        last_block = document.findBlockByNumber(last)
+        end = last_block.position() + last_block.length() - 1
+        new_text = "\n".join(lines)
         
-        start_block = self.document().findBlock(cursor.selectionStart())
-        end_block = self.document().findBlock(cursor.selectionEnd())
-        
+        cursor = QTextCursor(document)
         cursor.beginEditBlock()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.insertText(new_text)
+        cursor.endEditBlock()
         
-        cursor.setPosition(start_block.position())
-        
-        current_block = start_block
-        while current_block.isValid() and current_block.position() <= end_block.position():
-            cursor.movePosition(cursor.StartOfLine)
-            cursor.insertText("  ")
-            current_block = current_block.next()
-            cursor.movePosition(cursor.NextBlock)
+        cursor.setPosition(start)
+        cursor.setPosition(start + len(new_text.encode('utf-16-le')) // 2, QTextCursor.KeepAnchor)
+        self.setTextCursor(cursor)
+    
+    def indent_selection(self):
+        cursor = self.textCursor()
+        if not cursor.hasSelection():
+            return
         
-        cursor.endEditBlock()
+        first, last = self.selected_line_range()
+        lines = ["  " + line for line in self.line_texts(first, last)]
+        self.replace_lines(first, last, lines)
     
     def unindent_selection(self):
         cursor = self.textCursor()
         if not cursor.hasSelection():
             return
         
-        start_block = self.document().findBlock(cursor.selectionStart())
-        end_block = self.document().findBlock(cursor.selectionEnd())
-        
-        cursor.beginEditBlock()
-        
-        cursor.setPosition(start_block.position())
-        
-        current_block = start_block
-        while current_block.isValid() and current_block.position() <= end_block.position():
-            cursor.movePosition(cursor.StartOfLine)
-            line_text = current_block.text()
-            if line_text.startswith("  "):
-                cursor.movePosition(cursor.Right, cursor.KeepAnchor, 2)
-                cursor.removeSelectedText()
-            current_block = current_block.next()
-            cursor.movePosition(cursor.NextBlock)
-        
-        cursor.endEditBlock()
+        first, last = self.selected_line_range()
+        lines = self.line_texts(first, last)
+        if not any(line.startswith("  ") for line in lines):
+            return
+        lines = [line[2:] if line.startswith("  ") else line for line in lines]
+        self.replace_lines(first, last, lines)
     
     def unindent_current_line(self):
+        if self.isReadOnly():
+            return
         cursor = self.textCursor()
         cursor.movePosition(cursor.StartOfLine)
         line_text = cursor.block().text()
@@ -300,6 +783,303 @@ class YAMLEditor(QPlainTextEdit):
             cursor.movePosition(cursor.Right, cursor.KeepAnchor, 2)
             cursor.removeSelectedText()
 
+    def on_contents_change(self, position, chars_removed, chars_added):
+        first, old_last, delta = self.outline.update(position, chars_removed, chars_added)
+        if not self.folds:
+            return
+        
+        # Folds whose header or body was edited are opened; folds below the
+        # edit are shifted by the change in block count.
+        folds = {}
+        reopen = []
+        for header, end in self.folds.items():
+            if end < first:
+                folds[header] = end
+            elif header > old_last:
+                folds[header + delta] = end + delta
+            else:
+                reopen.append((header, end))
+        self.folds = folds
+        
+        document = self.document()
+        for header, end in reopen:
+            last = min(end + delta, document.blockCount() - 1)
+            self.set_blocks_visible(header + 1, max(last, header + 1), True)
+    
+    def set_blocks_visible(self, first, last, visible):
+        document = self.document()
+        block = document.findBlockByNumber(first)
+        if not block.isValid():
+            return
+        start = block.position()
+        shown = []
+        while block.isValid() and block.blockNumber() <= last:
+            if visible and block.blockNumber() in self.folds:
+                # Nested folds stay collapsed when their parent is opened
+                if block.isVisible() != visible:
+                    block.setVisible(visible)
+                    shown.append(block)
+                block = document.findBlockByNumber(self.folds[block.blockNumber()] + 1)
+                continue
+            if block.isVisible() != visible:
+                block.setVisible(visible)
+                if visible:
+                    shown.append(block)
+            block = block.next()
+        end_position = block.position() if block.isValid() else document.characterCount()
+        document.markContentsDirty(start, end_position - start)
+        
+        # Hidden blocks are skipped by the highlighter, so bring the ones that
+        # reappear up to date now.
+        for shown_block in shown:
+            self.highlighter.rehighlightBlock(shown_block)
+        
+        self.viewport().update()
+        self.line_number_widget.update()
+    
+    def fold(self, line):
+        if line in self.folds:
+            return False
+        end = self.outline.fold_end(line)
+        if end is None:
+            return False
+        
+        cursor = self.textCursor()
+        if line < cursor.blockNumber() <= end:
+            cursor.setPosition(self.document().findBlockByNumber(line).position())
+            cursor.movePosition(QTextCursor.EndOfBlock)
+            self.setTextCursor(cursor)
+        
+        self.folds[line] = end
+        self.set_blocks_visible(line + 1, end, False)
+        return True
+    
+    def unfold(self, line):
+        end = self.folds.pop(line, None)
+        if end is None:
+            return False
+        self.set_blocks_visible(line + 1, end, True)
+        return True
+    
+    def toggle_fold(self, line):
+        if not self.unfold(line):
+            self.fold(line)
+    
+    def fold_at_cursor(self):
+        line = self.outline.enclosing_fold(self.textCursor().blockNumber())
+        if line is not None:
+            self.fold(line)
+    
+    def unfold_at_cursor(self):
+        line = self.textCursor().blockNumber()
+        if not self.unfold(line):
+            line = self.outline.enclosing_fold(line)
+            if line is not None:
+                self.unfold(line)
+    
+    def fold_all(self):
+        # Innermost regions first so every nested fold is recorded
+        for line in reversed(range(len(self.outline.indents))):
+            if self.outline.is_foldable(line):
+                self.fold(line)
+    
+    def unfold_all(self):
+        if not self.folds:
+            return
+        self.folds = {}
+        self.set_blocks_visible(0, self.document().blockCount() - 1, True)
+    
+    def folded_lines(self):
+        return sorted(self.folds)
+    
+    def restore_folds(self, lines):
+        for line in sorted(lines, reverse=True):
+            self.fold(line)
+    
+    def reveal_line(self, line):
+        for header, end in sorted(self.folds.items()):
+            if header < line <= end:
+                self.unfold(header)
+    
+    def goto_position(self, line, column=0):
+        block = self.document().findBlockByNumber(line)
+        if not block.isValid():
+            return
+        self.reveal_line(line)
+        cursor = self.textCursor()
+        cursor.setPosition(block.position() + min(column, block.length() - 1))
+        self.setTextCursor(cursor)
+        self.centerCursor()
+        self.setFocus()
+
+    def find_matches(self, search_text, use_regex=False):
+        # Returns (start, end, match) tuples in document positions. The
+        # document counts UTF-16 code units while Python counts code points,
+        # so offsets are only shifted when the text contains astral characters.
+        pattern = re.compile(search_text if use_regex else re.escape(search_text))
+        text = self.toPlainText()
+        matches = pattern.finditer(text)
+
+        if len(text.encode('utf-16-le')) == 2 * len(text):
+            return [(m.start(), m.end(), m) for m in matches]
+
+        results = []
+        shift = 0
+        last = 0
+        for m in matches:
+            shift += len(ASTRAL_CHARS.findall(text, last, m.start()))
+            start = m.start() + shift
+            shift += len(ASTRAL_CHARS.findall(text, m.start(), m.end()))
+            results.append((start, m.end() + shift, m))
+            last = m.end()
+        return results
+
+    def apply_edits(self, edits):
+        # Applies (start, end, replacement) edits as a single undo step.
+        # Edits are applied back to front so earlier positions stay valid, and
+        # each one is its own joined edit block so the document only reports
+        # (and the highlighter only revisits) the blocks that actually changed.
+        # textChanged is emitted once for the whole batch.
+        if not edits or self.isReadOnly():
+            return 0
+
+        cursor = QTextCursor(self.document())
+        self.blockSignals(True)
+        try:
+            for index, (start, end, replacement) in enumerate(reversed(edits)):
+                if index == 0:
+                    cursor.beginEditBlock()
+                else:
+                    cursor.joinPreviousEditBlock()
+                cursor.setPosition(start)
+                cursor.setPosition(end, QTextCursor.KeepAnchor)
+                cursor.insertText(replacement)
+                cursor.endEditBlock()
+        finally:
+            self.blockSignals(False)
+
+        self.update_line_number_width(0)
+        self.line_number_widget.update()
+        self.highlight_current_line()
+        self.textChanged.emit()
+        return len(edits)
+
+    def replace_all(self, search_text, replace_text, use_regex=False):
+        matches = self.find_matches(search_text, use_regex)
+        if use_regex:
+            edits = [(start, end, m.expand(replace_text)) for start, end, m in matches]
+        else:
+            edits = [(start, end, replace_text) for start, end, _ in matches]
+        return self.apply_edits(edits)
+
+class OutlineItem:
+    def __init__(self, parent=None, row=0):
+        self.parent = parent
+        self.row = row
+        self.type = ""
+        self.text = ""
+        self.line = 0
+        self.column = 0
+        self.children = []
+
+    def path(self):
+        rows = []
+        item = self
+        while item.parent is not None:
+            rows.append(item.row)
+            item = item.parent
+        return rows[::-1]
+
+class OutlineModel(QAbstractItemModel):
+    # Item model over the component outline. Views only query the rows they
+    # paint, so large pages never create one widget per component. Updates are
+    # reconciled against the current tree: unchanged rows are left alone,
+    # edited rows emit dataChanged and only added or removed rows are
+    # inserted or removed, which keeps expansion and selection state.
+    SNIPPET_LENGTH = 40
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = OutlineItem()
+
+    def item_from_index(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        parent_item = self.item_from_index(parent)
+        if column != 0 or row < 0 or row >= len(parent_item.children):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_item.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_item = index.internalPointer().parent
+        if parent_item is None or parent_item is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_item.row, 0, parent_item)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.item_from_index(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = index.internalPointer()
+        if role == Qt.DisplayRole:
+            text = " ".join(str(item.text).split())
+            if len(text) > self.SNIPPET_LENGTH:
+                text = text[:self.SNIPPET_LENGTH - 1] + "…"
+            return f"{item.type}  {text}" if text else item.type
+        if role == Qt.ToolTipRole:
+            return f"{item.type} (line {item.line + 1})"
+        return None
+
+    def update_outline(self, entries):
+        self.reconcile(self.root, entries, QModelIndex())
+
+    def reconcile(self, item, entries, parent_index):
+        children = item.children
+        common = min(len(children), len(entries))
+
+        for row in range(common):
+            child = children[row]
+            entry = entries[row]
+            if child.type != entry["type"] or child.text != entry["text"]:
+                child.type = entry["type"]
+                child.text = entry["text"]
+                index = self.createIndex(row, 0, child)
+                self.dataChanged.emit(index, index)
+            child.line = entry["line"]
+            child.column = entry["column"]
+            self.reconcile(child, entry["children"], self.createIndex(row, 0, child))
+
+        if len(children) > len(entries):
+            self.beginRemoveRows(parent_index, len(entries), len(children) - 1)
+            del children[len(entries):]
+            self.endRemoveRows()
+        elif len(entries) > len(children):
+            self.beginInsertRows(parent_index, len(children), len(entries) - 1)
+            for row in range(len(children), len(entries)):
+                child = OutlineItem(item, row)
+                children.append(child)
+                self.fill(child, entries[row])
+            self.endInsertRows()
+
+    def fill(self, item, entry):
+        item.type = entry["type"]
+        item.text = entry["text"]
+        item.line = entry["line"]
+        item.column = entry["column"]
+        item.children = [OutlineItem(item, row) for row in range(len(entry["children"]))]
+        for child, child_entry in zip(item.children, entry["children"]):
+            self.fill(child, child_entry)
+
 class HTMLHighlighter(QSyntaxHighlighter):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -330,28 +1110,220 @@ class HTMLHighlighter(QSyntaxHighlighter):
         css_value_format = QTextCharFormat()
         css_value_format.setForeground(QColor("#4dabf7"))
         self.highlighting_rules.append((r':\s*[^;]+', css_value_format))
+        
+        # Blocks are only highlighted once asked for, see highlight_block().
+        # Qt re-runs highlightBlock when a block's text changes, as the last
+        # one does when the next chunk is appended, so membership rather than
+        # the caller decides whether formats are applied.
+        self.highlighted_blocks = set()
+
+    def highlight_block(self, block):
+        if block.blockNumber() in self.highlighted_blocks:
+            return
+        self.highlighted_blocks.add(block.blockNumber())
+        self.rehighlightBlock(block)
 
     def highlightBlock(self, text):
+        if self.currentBlock().blockNumber() not in self.highlighted_blocks:
+            return
         for pattern, format in self.highlighting_rules:
             for match in re.finditer(pattern, text):
                 start = match.start()
                 length = match.end() - start
                 self.setFormat(start, length, format)
 
+class HTMLSourceView(QPlainTextEdit):
+    # Read-only source viewer for large documents. Text is appended in chunks
+    # from the event loop so the dialog paints immediately, and only the
+    # blocks scrolled into view are ever run through the highlighter.
+    CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.highlighter = HTMLHighlighter(self.document())
+        self.source = ""
+        self.load_position = 0
+        self.pending_line = None
+        
+        self.load_timer = QTimer(self)
+        self.load_timer.timeout.connect(self.load_next_chunk)
+        self.verticalScrollBar().valueChanged.connect(self.highlight_visible_blocks)
+    
+    def set_source(self, source, line=None):
+        self.load_timer.stop()
+        self.clear()
+        self.highlighter.highlighted_blocks.clear()
+        self.source = source
+        self.load_position = 0
+        self.pending_line = line
+        self.load_next_chunk()
+        if self.load_position < len(self.source):
+            self.load_timer.start(0)
+    
+    def load_next_chunk(self):
+        end = self.source.find("\n", self.load_position + self.CHUNK_SIZE)
+        if end == -1:
+            end = len(self.source)
+        
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(self.source[self.load_position:end])
+        self.load_position = end
+        
+        if self.load_position >= len(self.source):
+            self.load_timer.stop()
+        
+        if self.pending_line is not None and self.pending_line < self.blockCount():
+            self.scroll_to_line(self.pending_line)
+            self.pending_line = None
+        
+        self.highlight_visible_blocks()
+    
+    def scroll_to_line(self, line):
+        block = self.document().findBlockByNumber(line)
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+        self.setTextCursor(cursor)
+        self.verticalScrollBar().setValue(max(0, line - 3))
+    
+    def highlight_visible_blocks(self, *args):
+        block = self.firstVisibleBlock()
+        offset = self.contentOffset()
+        height = self.viewport().height()
+        while block.isValid():
+            if self.blockBoundingGeometry(block).translated(offset).top() > height:
+                break
+            self.highlighter.highlight_block(block)
+            block = block.next()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.highlight_visible_blocks()
+
+class DocumentTab(QWidget):
+    # One open document: its editor, file and save state, recovery journal,
+    # and the last few pages rendered from it keyed on the text's hash, so
+    # switching back to a tab or undoing an edit reuses the rendered page.
+    # Whole pages are cached rather than per-component fragments: the whole
+    # text has to be parsed again after any edit, and parsing costs far more
+    # than rendering the page from the parsed data.
+    RENDER_CACHE_SIZE = 4
+
+    def __init__(self, journal, parent=None):
+        super().__init__(parent)
+        self.editor = YAMLEditor()
+        self.editor.setStyleSheet("""
+            QPlainTextEdit {
+                background-color: #161b22;
+                color: #f0f6fc;
+                border: 1px solid #30363d;
+                border-radius: 8px;
+                padding: 10px;
+                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+                font-size: 14px;
+                line-height: 1.4;
+            }
+            QPlainTextEdit:focus {
+                border: 1px solid #4dabf7;
+                background-color: #1c2128;
+            }
+        """)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.editor)
+        
+        self.journal = journal
+        self.current_file = None
+        self.title = "Untitled"
+        self.saved_hash = None
+        self.modified = False
+        self.last_save_id = None
+        self.save_failed = False
+        self.file_load = None
+        self.load_timer = QTimer(self)
+        self.render_cache = OrderedDict()
+        self.render_generation = 0
+        self.outline = []
+        self.source_map = None
+        self.preview_scroll = None
+        self.server_key = None
+        # Only ever used on the validation worker, which keeps its cache
+        self.validator = SchemaValidator()
+        self.validation_generation = 0
+        self.validation_revision = None
+        self.render_revision = None
+        self.diagnostics = []
+        self.syntax_diagnostics = []
+        self.last_good_html = None
+
+    def is_blank(self):
+        return (self.current_file is None and self.file_load is None
+                and not self.editor.document().isModified()
+                and self.editor.document().characterCount() <= 1)
+
+    def cached_render(self, key):
+        result = self.render_cache.get(key)
+        if result is not None:
+            self.render_cache.move_to_end(key)
+        return result
+
+    def store_render(self, key, result):
+        self.render_cache[key] = result
+        self.render_cache.move_to_end(key)
+        while len(self.render_cache) > self.RENDER_CACHE_SIZE:
+            self.render_cache.popitem(last=False)
+
 class YAMLPreviewApp(QMainWindow):
+    save_finished = pyqtSignal(int, str, str)
+    render_finished = pyqtSignal(object, int, object, object, object)
+    validation_finished = pyqtSignal(object, int, object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("WebForge")
         self.setMinimumSize(1200, 800)
-        self.current_file = None
-        self.modified = False
-        self.initial_content = ""
+        self.markdown_converter = None
+        self.docs_readme_stamp = None
+        
+        self.save_executor = ThreadPoolExecutor(max_workers=1)
+        self.save_count = 0
+        self.pending_saves = {}
+        self.save_finished.connect(self.on_save_finished)
+        # One worker renders for every tab; only the active tab submits work
+        self.render_executor = ThreadPoolExecutor(max_workers=1)
+        self.render_finished.connect(self.on_render_finished)
+        # Validation has its own worker so it never delays a render
+        self.validate_executor = ThreadPoolExecutor(max_workers=1)
+        self.validation_finished.connect(self.on_validation_finished)
+        self.validation_enabled = QSettings("WebForge", "WebForge").value("editor/validate", True, type=bool)
+        self.preview_server = None
+        self.render_profiling = False
+        self.render_profiles = deque(maxlen=RENDER_PROFILE_HISTORY)
+        self.loading_profile = None
+        self.recovery_directory = os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.GenericDataLocation), "WebForge", "recovery")
+        self.journal_timer = QTimer(self)
+        self.journal_timer.setSingleShot(True)
+        self.journal_timer.timeout.connect(self.flush_journal)
+        self.recovery_offered = False
+        self.fsync_mode = QSettings("WebForge", "WebForge").value("save/fsync", "file")
+        if self.fsync_mode not in dict(FSYNC_MODES):
+            self.fsync_mode = "file"
         
         self.setup_icons()
+        startup_profile.mark("icons")
         
         self.preview_timer = QTimer()
         self.preview_timer.setSingleShot(True)
         self.preview_timer.timeout.connect(self.update_preview)
+        self.scroll_sync_enabled = QSettings("WebForge", "WebForge").value("preview/sync_scroll", True, type=bool)
+        self.scroll_sync_timer = QTimer()
+        self.scroll_sync_timer.setSingleShot(True)
+        self.scroll_sync_timer.setInterval(SCROLL_SYNC_INTERVAL_MS)
+        self.scroll_sync_timer.timeout.connect(self.sync_preview_scroll)
         self.setStyleSheet("""
             QMainWindow {
                 background-color: #0d1117;
@@ -499,7 +1471,9 @@ class YAMLPreviewApp(QMainWindow):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
         
+        self.create_outline_dock()
         self.create_toolbar()
+        startup_profile.mark("toolbar and outline")
 
         splitter = QSplitter(Qt.Horizontal)
         splitter.setStyleSheet("""
@@ -513,27 +1487,235 @@ class YAMLPreviewApp(QMainWindow):
         """)
         layout.addWidget(splitter)
 
-        self.yaml_editor = YAMLEditor()
-        self.yaml_editor.textChanged.connect(self.on_editor_text_changed)
-        self.yaml_editor.setStyleSheet("""
-            QPlainTextEdit {
+        self.tabs = QTabWidget()
+        self.tabs.setTabsClosable(True)
+        self.tabs.setMovable(True)
+        self.tabs.setDocumentMode(True)
+        self.tabs.setStyleSheet("""
+            QTabWidget::pane {
+                border: none;
+            }
+            QTabBar::tab {
                 background-color: #161b22;
+                color: #7d8590;
+                border: 1px solid #30363d;
+                border-bottom: none;
+                border-top-left-radius: 6px;
+                border-top-right-radius: 6px;
+                padding: 6px 14px;
+                margin-right: 2px;
+            }
+            QTabBar::tab:selected {
+                background-color: #1c2128;
                 color: #f0f6fc;
+            }
+            QTabBar::tab:hover {
+                color: #4dabf7;
+            }
+        """)
+        self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        splitter.addWidget(self.tabs)
+
+        # Chromium is started only after the window has painted; until then a
+        # plain placeholder holds the preview's place in the splitter.
+        self.preview_area = None
+        self.preview_pending = False
+        self.displayed_html = None
+        self.highlighted_component = None
+        self.preview_tab = None
+        self.preview_loading = False
+        self.preview_placeholder = QLabel("Loading preview…")
+        self.preview_placeholder.setAlignment(Qt.AlignCenter)
+        self.preview_placeholder.setMinimumWidth(400)
+        self.preview_placeholder.setStyleSheet("""
+            QLabel {
+                color: #7d8590;
                 border: 1px solid #30363d;
                 border-radius: 8px;
-                padding: 10px;
-                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-                font-size: 14px;
-                line-height: 1.4;
             }
-            QPlainTextEdit:focus {
-                border: 1px solid #4dabf7;
-                background-color: #1c2128;
+        """)
+        splitter.addWidget(self.preview_placeholder)
+        self.splitter = splitter
+
+        splitter.setSizes([600, 600])
+
+        self.statusBar().showMessage("Ready")
+        
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.setMaximumHeight(14)
+        self.load_progress.setTextVisible(False)
+        self.load_progress.setStyleSheet("""
+            QProgressBar {
+                background-color: #161b22;
+                border: 1px solid #30363d;
+                border-radius: 4px;
+            }
+            QProgressBar::chunk {
+                background-color: #4dabf7;
+                border-radius: 3px;
             }
         """)
-        splitter.addWidget(self.yaml_editor)
+        self.load_progress.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
+        
+        self.diagnostics_label = QLabel()
+        self.diagnostics_label.setStyleSheet("color: #ffa94d; padding: 0 6px;")
+        self.diagnostics_label.hide()
+        self.statusBar().addPermanentWidget(self.diagnostics_label)
+        
+        self.profile_label = QLabel()
+        self.profile_label.setStyleSheet("color: #8b949e; font-family: 'Consolas', monospace; padding: 0 6px;")
+        self.profile_label.hide()
+        self.statusBar().addPermanentWidget(self.profile_label)
+
+        self.new_tab()
+        startup_profile.mark("window constructed")
+
+    @property
+    def document_tab(self):
+        return self.tabs.currentWidget()
+
+    @property
+    def yaml_editor(self):
+        return self.document_tab.editor
+
+    @property
+    def journal(self):
+        return self.document_tab.journal
+
+    @property
+    def file_load(self):
+        return self.document_tab.file_load
+
+    @property
+    def current_file(self):
+        return self.document_tab.current_file
+
+    @current_file.setter
+    def current_file(self, file_path):
+        self.document_tab.current_file = file_path
+
+    @property
+    def saved_hash(self):
+        return self.document_tab.saved_hash
+
+    @saved_hash.setter
+    def saved_hash(self, value):
+        self.document_tab.saved_hash = value
+
+    @property
+    def modified(self):
+        return self.document_tab.modified
+
+    def document_tabs(self):
+        return [self.tabs.widget(index) for index in range(self.tabs.count())]
+
+    def new_tab(self):
+        tab = DocumentTab(RecoveryJournal(self.recovery_directory))
+        tab.editor.textChanged.connect(lambda tab=tab: self.on_editor_text_changed(tab))
+        tab.editor.document().modificationChanged.connect(
+            lambda modified, tab=tab: self.on_modification_changed(tab, modified))
+        tab.editor.document().contentsChange.connect(
+            lambda position, removed, added, tab=tab: self.on_document_change(tab, position, removed, added))
+        tab.editor.cursorPositionChanged.connect(lambda tab=tab: self.highlight_source_component(tab))
+        tab.editor.verticalScrollBar().valueChanged.connect(lambda value, tab=tab: self.schedule_scroll_sync(tab))
+        tab.load_timer.timeout.connect(lambda tab=tab: self.load_next_file_chunk(tab))
+        self.tabs.setCurrentIndex(self.tabs.addTab(tab, tab.title))
+        self.mark_saved("", tab)
+        return tab
+
+    def reusable_tab(self):
+        if self.document_tab.is_blank():
+            return self.document_tab
+        return self.new_tab()
+
+    def set_document_title(self, title, tab=None):
+        tab = tab if tab is not None else self.document_tab
+        tab.title = title
+        self.update_tab_label(tab)
+
+    def update_tab_label(self, tab):
+        index = self.tabs.indexOf(tab)
+        if index < 0:
+            return
+        self.tabs.setTabText(index, f"{tab.title} •" if tab.modified else tab.title)
+        self.tabs.setTabToolTip(index, tab.current_file or "")
+        if tab is self.document_tab:
+            self.setWindowTitle(f"WebForge - {tab.title}")
 
+    def on_tab_changed(self, index):
+        if index < 0:
+            return
+        tab = self.document_tab
+        self.preview_timer.stop()
+        self.update_tab_label(tab)
+        self.outline_model.update_outline(tab.outline)
+        self.show_diagnostics(tab)
+        if tab.file_load is not None:
+            self.load_progress.setRange(0, max(1, len(tab.file_load["data"])))
+            self.load_progress.setValue(tab.file_load["position"])
+            self.load_progress.show()
+        else:
+            self.load_progress.hide()
+            self.update_preview()
+
+    def close_tab(self, index):
+        tab = self.tabs.widget(index)
+        if not self.confirm_close_document(tab):
+            return
+        self.release_tab(tab)
+        self.tabs.removeTab(self.tabs.indexOf(tab))
+        tab.deleteLater()
+        if self.tabs.count() == 0:
+            self.new_tab()
+
+    def close_current_tab(self):
+        self.close_tab(self.tabs.currentIndex())
+
+    def confirm_close_document(self, tab):
+        # Only a tab that needs the prompt is brought to the front; switching
+        # tabs renders the preview, which clean tabs being closed don't need
+        if self.has_unsaved_changes(tab):
+            self.tabs.setCurrentWidget(tab)
+            reply = QMessageBox.question(self, 'Save Changes',
+                f'Do you want to save your changes to {tab.title} before closing?',
+                QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
+            
+            if reply == QMessageBox.Save:
+                if not self.save_file(wait=True):
+                    return False
+            elif reply == QMessageBox.Cancel:
+                return False
+        
+        if any(entry[0] is tab for entry in self.pending_saves.values()):
+            return self.wait_for_saves(tab)
+        return True
+
+    def release_tab(self, tab):
+        if tab.server_key is not None:
+            self.preview_server.unpublish(tab.server_key)
+        self.cancel_file_load(tab)
+        self.save_fold_state(tab)
+        tab.journal.close()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.preview_area is None:
+            QTimer.singleShot(0, self.init_preview)
+        if not self.recovery_offered:
+            self.recovery_offered = True
+            QTimer.singleShot(0, self.offer_recovery)
+
+    def init_preview(self):
+        if self.preview_area is not None:
+            return
+        startup_profile.mark("first paint")
+        from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
+        startup_profile.mark("import QtWebEngine")
         self.preview_area = QWebEngineView()
+        self.preview_area.setPage(QWebEnginePage(self.create_preview_profile(), self.preview_area))
         self.preview_area.setMinimumWidth(400)
         self.preview_area.setStyleSheet("""
             QWebEngineView {
@@ -542,15 +1724,64 @@ class YAMLPreviewApp(QMainWindow):
                 border-radius: 8px;
             }
         """)
+        self.preview_area.loadFinished.connect(self.on_first_preview_loaded)
+        self.preview_area.loadFinished.connect(self.on_preview_loaded)
         self.setup_javascript_bridge()
-        splitter.addWidget(self.preview_area)
+        self.splitter.replaceWidget(self.splitter.indexOf(self.preview_placeholder), self.preview_area)
+        self.preview_placeholder.deleteLater()
+        self.preview_placeholder = None
+        startup_profile.mark("preview engine created")
+        if self.preview_pending:
+            self.preview_pending = False
+            self.update_preview()
 
-        splitter.setSizes([600, 600])
+    def create_preview_profile(self):
+        # A named profile keeps its HTTP cache on disk between sessions, so
+        # remote images are not fetched again for every refresh or launch.
+        # It belongs to the application so that it outlives the page.
+        from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+        cache_mb = QSettings("WebForge", "WebForge").value("preview/cache_mb", PREVIEW_CACHE_MB, type=int)
+        profile = QWebEngineProfile("WebForgePreview", QCoreApplication.instance())
+        profile.setCachePath(os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation), "WebForge", "preview"))
+        profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        profile.setHttpCacheMaximumSize(cache_mb * 1024 * 1024)
+        self.preview_profile = profile
+        return profile
 
-        self.statusBar().showMessage("Ready")
+    def preview_cache_usage(self):
+        files = 0
+        size = 0
+        for directory, _, names in os.walk(self.preview_profile.cachePath()):
+            for name in names:
+                try:
+                    size += os.path.getsize(os.path.join(directory, name))
+                except OSError:
+                    continue
+                files += 1
+        return files, size
 
-        self.yaml_editor.setPlainText("")
-        self.initial_content = ""
+    def show_preview_cache_stats(self):
+        if self.preview_area is None:
+            return
+        profile = self.preview_profile
+        files, size = self.preview_cache_usage()
+        limit = profile.httpCacheMaximumSize()
+        QMessageBox.information(self, "Preview Cache",
+            f"Used: {size / (1024 * 1024):.1f} MB in {files} files\n"
+            f"Limit: {limit / (1024 * 1024):.0f} MB\n"
+            f"Location: {profile.cachePath()}")
+
+    def clear_preview_cache(self):
+        if self.preview_area is None:
+            return
+        _, size = self.preview_cache_usage()
+        self.preview_profile.clearHttpCache()
+        self.statusBar().showMessage(f"Cleared the preview cache ({size / (1024 * 1024):.1f} MB)", 3000)
+
+    def on_first_preview_loaded(self, ok):
+        self.preview_area.loadFinished.disconnect(self.on_first_preview_loaded)
+        startup_profile.mark("first preview loaded")
 
     def setup_icons(self):
         try:
@@ -598,31 +1829,159 @@ class YAMLPreviewApp(QMainWindow):
             print(f"❌ Error setting up icons: {e}")
             self.create_fallback_icon()
 
-    def create_fallback_icon(self):
-        try:
-            from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont
-            
-            pixmap = QPixmap(32, 32)
-            pixmap.fill(QColor("#0d1117"))
-            
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.Antialiasing)
-            
-            painter.setBrush(QColor("#4dabf7"))
-            painter.setPen(QColor("#4dabf7"))
-            painter.drawEllipse(2, 2, 28, 28)
-            
-            painter.setPen(QColor("#ffffff"))
-            painter.setFont(QFont("Arial", 12, QFont.Bold))
-            painter.drawText(pixmap.rect(), Qt.AlignCenter, "WF")
-            painter.end()
-            
-            icon = QIcon(pixmap)
-            self.setWindowIcon(icon)
-            print("✅ Created fallback icon")
-            
-        except Exception as e:
-            print(f"❌ Error creating fallback icon: {e}")
+    def create_fallback_icon(self):
+        try:
+            from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont
+            
+            pixmap = QPixmap(32, 32)
+            pixmap.fill(QColor("#0d1117"))
+            
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            
+            painter.setBrush(QColor("#4dabf7"))
+            painter.setPen(QColor("#4dabf7"))
+            painter.drawEllipse(2, 2, 28, 28)
+            
+            painter.setPen(QColor("#ffffff"))
+            painter.setFont(QFont("Arial", 12, QFont.Bold))
+            painter.drawText(pixmap.rect(), Qt.AlignCenter, "WF")
+            painter.end()
+            
+            icon = QIcon(pixmap)
+            self.setWindowIcon(icon)
+            print("✅ Created fallback icon")
+            
+        except Exception as e:
+            print(f"❌ Error creating fallback icon: {e}")
+
+    def create_outline_dock(self):
+        self.outline_model = OutlineModel(self)
+        
+        self.outline_view = QTreeView()
+        self.outline_view.setModel(self.outline_model)
+        self.outline_view.setHeaderHidden(True)
+        self.outline_view.setUniformRowHeights(True)
+        self.outline_view.setExpandsOnDoubleClick(False)
+        self.outline_view.setStyleSheet("""
+            QTreeView {
+                background-color: #161b22;
+                color: #f0f6fc;
+                border: 1px solid #30363d;
+                border-radius: 8px;
+                padding: 6px;
+                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+                font-size: 13px;
+            }
+            QTreeView::item {
+                padding: 3px 0px;
+            }
+            QTreeView::item:hover {
+                background-color: #21262d;
+            }
+            QTreeView::item:selected {
+                background-color: #4dabf7;
+                color: #ffffff;
+            }
+        """)
+        self.outline_view.clicked.connect(self.on_outline_clicked)
+        self.outline_view.activated.connect(self.on_outline_clicked)
+        
+        self.outline_dock = QDockWidget("Outline", self)
+        self.outline_dock.setObjectName("outline_dock")
+        self.outline_dock.setWidget(self.outline_view)
+        self.outline_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+        self.outline_dock.setStyleSheet("""
+            QDockWidget {
+                color: #f0f6fc;
+                font-weight: 600;
+            }
+            QDockWidget::title {
+                background-color: #161b22;
+                padding: 6px;
+            }
+        """)
+        self.addDockWidget(Qt.LeftDockWidgetArea, self.outline_dock)
+
+    def on_outline_clicked(self, index):
+        item = self.outline_model.item_from_index(index)
+        if item is self.outline_model.root:
+            return
+        self.yaml_editor.goto_position(item.line, item.column)
+        self.scroll_preview_to(item.path())
+
+    def highlight_source_component(self, tab):
+        # The map belongs to the page on screen, so until the next refresh
+        # lines inserted above the cursor shift the match slightly.
+        if tab is not self.document_tab or tab.source_map is None or self.preview_area is None:
+            return
+        component = tab.source_map.component_at(tab.editor.textCursor().blockNumber())
+        if component == self.highlighted_component:
+            return
+        self.highlighted_component = component
+        self.preview_area.page().runJavaScript(
+            "window.webforgeHighlight && window.webforgeHighlight(%s);" % json.dumps(component))
+
+    def schedule_scroll_sync(self, tab):
+        # Scrolling delivers many value changes per frame; they are coalesced
+        # into at most one call into the page per interval.
+        if self.scroll_sync_enabled and tab is self.document_tab and not self.scroll_sync_timer.isActive():
+            self.scroll_sync_timer.start()
+
+    def sync_preview_scroll(self):
+        tab = self.document_tab
+        if (self.preview_area is None or self.preview_loading or tab.source_map is None
+                or self.preview_tab is not tab or not len(tab.source_map)):
+            return
+        editor = tab.editor
+        line = editor.cursorForPosition(QPoint(0, 0)).blockNumber()
+        component = tab.source_map.component_at(line)
+        if component is None:
+            # Lines before the first component show the top of the page;
+            # lines between components keep the preview where it is.
+            if line >= tab.source_map.position_of(0)[0]:
+                return
+            fraction = 0.0
+        else:
+            start, end = tab.source_map.line_range(component)
+            fraction = (line - start) / (end - start)
+        self.preview_area.page().runJavaScript(
+            "window.webforgeScrollTo && window.webforgeScrollTo(%s, %r);" % (json.dumps(component), fraction))
+
+    def set_scroll_sync_enabled(self, enabled):
+        self.scroll_sync_enabled = enabled
+        QSettings("WebForge", "WebForge").setValue("preview/sync_scroll", enabled)
+        if enabled:
+            self.scroll_sync_timer.start()
+
+    def reveal_source(self, component):
+        source_map = self.document_tab.source_map
+        if source_map is None or not 0 <= component < len(source_map):
+            return
+        self.yaml_editor.goto_position(*source_map.position_of(component))
+
+    def scroll_preview_to(self, path):
+        # Text wrappers are emitted before a container's children, so they are
+        # skipped to line element positions up with the outline rows.
+        if self.preview_area is None:
+            return
+        self.preview_area.page().runJavaScript("""
+            (function (path) {
+                var element = document.body;
+                for (var i = 0; i < path.length && element; i++) {
+                    var children = Array.prototype.filter.call(element.children, function (child) {
+                        return child.tagName !== 'SCRIPT' &&
+                            !child.classList.contains('body-text') &&
+                            !child.classList.contains('section-text') &&
+                            !child.classList.contains('div-text');
+                    });
+                    element = children[path[i]];
+                }
+                if (element && element !== document.body) {
+                    element.scrollIntoView({behavior: 'smooth', block: 'center'});
+                }
+            })(%s);
+        """ % list(path))
 
     def create_toolbar(self):
         toolbar = QToolBar()
@@ -698,9 +2057,26 @@ class YAMLPreviewApp(QMainWindow):
 
         save_action = QAction("Save", self)
         save_action.setStatusTip("Save the current file")
-        save_action.triggered.connect(self.save_file)
+        save_action.triggered.connect(lambda: self.save_file())
         file_menu.addAction(save_action)
         
+        close_tab_action = QAction("Close Tab", self)
+        close_tab_action.setShortcut("Ctrl+W")
+        close_tab_action.setStatusTip("Close the current document")
+        close_tab_action.triggered.connect(self.close_current_tab)
+        file_menu.addAction(close_tab_action)
+        self.addAction(close_tab_action)
+        
+        durability_menu = file_menu.addMenu("Save Durability")
+        durability_group = QActionGroup(self)
+        for mode, label in FSYNC_MODES:
+            mode_action = QAction(label, self)
+            mode_action.setCheckable(True)
+            mode_action.setChecked(mode == self.fsync_mode)
+            mode_action.triggered.connect(lambda checked, mode=mode: self.set_fsync_mode(mode))
+            durability_group.addAction(mode_action)
+            durability_menu.addAction(mode_action)
+        
         file_menu.addSeparator()
         
         export_action = QAction("Export HTML", self)
@@ -750,6 +2126,38 @@ class YAMLPreviewApp(QMainWindow):
         view_html_action.triggered.connect(self.view_html)
         preview_menu.addAction(view_html_action)
         
+        preview_menu.addSeparator()
+        
+        sync_scroll_action = QAction("Sync Scrolling", self)
+        sync_scroll_action.setCheckable(True)
+        sync_scroll_action.setChecked(self.scroll_sync_enabled)
+        sync_scroll_action.setStatusTip("Scroll the preview along with the editor")
+        sync_scroll_action.toggled.connect(self.set_scroll_sync_enabled)
+        preview_menu.addAction(sync_scroll_action)
+        
+        cache_stats_action = QAction("Preview Cache Statistics", self)
+        cache_stats_action.setStatusTip("Show how much the preview's HTTP cache holds")
+        cache_stats_action.triggered.connect(self.show_preview_cache_stats)
+        preview_menu.addAction(cache_stats_action)
+        
+        clear_cache_action = QAction("Clear Preview Cache", self)
+        clear_cache_action.setStatusTip("Discard cached images and other remote assets")
+        clear_cache_action.triggered.connect(self.clear_preview_cache)
+        preview_menu.addAction(clear_cache_action)
+        
+        preview_menu.addSeparator()
+        
+        profiling_action = QAction("Render Profiling", self)
+        profiling_action.setCheckable(True)
+        profiling_action.setStatusTip("Time each preview refresh by phase and component type")
+        profiling_action.toggled.connect(self.set_render_profiling)
+        preview_menu.addAction(profiling_action)
+        
+        trace_action = QAction("Export Render Trace", self)
+        trace_action.setStatusTip("Save recent render profiles as a Chrome trace")
+        trace_action.triggered.connect(self.export_render_trace)
+        preview_menu.addAction(trace_action)
+        
         preview_btn = QToolButton()
         preview_btn.setText("Preview")
         preview_btn.setMenu(preview_menu)
@@ -797,6 +2205,42 @@ class YAMLPreviewApp(QMainWindow):
         goto_line_action.triggered.connect(self.show_goto_line_dialog)
         edit_menu.addAction(goto_line_action)
         
+        outline_action = self.outline_dock.toggleViewAction()
+        outline_action.setText("Outline")
+        outline_action.setStatusTip("Show or hide the component outline")
+        edit_menu.addAction(outline_action)
+        
+        edit_menu.addSeparator()
+        
+        fold_action = QAction("Fold", self)
+        fold_action.setStatusTip("Fold the section at the cursor (Ctrl+Shift+[)")
+        fold_action.triggered.connect(self.fold_current_section)
+        edit_menu.addAction(fold_action)
+        
+        unfold_action = QAction("Unfold", self)
+        unfold_action.setStatusTip("Unfold the section at the cursor (Ctrl+Shift+])")
+        unfold_action.triggered.connect(self.unfold_current_section)
+        edit_menu.addAction(unfold_action)
+        
+        fold_all_action = QAction("Fold All", self)
+        fold_all_action.setStatusTip("Fold every section")
+        fold_all_action.triggered.connect(self.fold_all_sections)
+        edit_menu.addAction(fold_all_action)
+        
+        unfold_all_action = QAction("Unfold All", self)
+        unfold_all_action.setStatusTip("Unfold every section")
+        unfold_all_action.triggered.connect(self.unfold_all_sections)
+        edit_menu.addAction(unfold_all_action)
+        
+        edit_menu.addSeparator()
+        
+        validate_action = QAction("Validate Components", self)
+        validate_action.setCheckable(True)
+        validate_action.setChecked(self.validation_enabled)
+        validate_action.setStatusTip("Check components against the schema while editing")
+        validate_action.toggled.connect(self.set_validation_enabled)
+        edit_menu.addAction(validate_action)
+        
         edit_btn = QToolButton()
         edit_btn.setText("Edit")
         edit_btn.setMenu(edit_menu)
@@ -836,21 +2280,198 @@ class YAMLPreviewApp(QMainWindow):
         toolbar.addWidget(help_btn)
 
 
-    def on_editor_text_changed(self):
-        current_content = self.yaml_editor.toPlainText()
-        self.modified = (current_content != self.initial_content)
+    def on_editor_text_changed(self, tab):
+        # Background tabs never render; they catch up when they are shown
+        if tab.file_load is not None or tab is not self.document_tab:
+            return
         self.preview_timer.start(500)
 
+    def fold_current_section(self):
+        self.yaml_editor.fold_at_cursor()
+
+    def unfold_current_section(self):
+        self.yaml_editor.unfold_at_cursor()
+
+    def fold_all_sections(self):
+        self.yaml_editor.fold_all()
+
+    def unfold_all_sections(self):
+        self.yaml_editor.unfold_all()
+
+    def fold_state_key(self, file_path):
+        digest = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return f"folds/{digest}"
+
+    def save_fold_state(self, tab=None):
+        # Fold lines are only meaningful against the file as saved on disk
+        tab = tab if tab is not None else self.document_tab
+        if not tab.current_file or tab.modified:
+            return
+        settings = QSettings("WebForge", "WebForge")
+        lines = tab.editor.folded_lines()
+        key = self.fold_state_key(tab.current_file)
+        if lines:
+            settings.setValue(key, ",".join(str(line) for line in lines))
+        else:
+            settings.remove(key)
+
+    def restore_fold_state(self, tab=None):
+        tab = tab if tab is not None else self.document_tab
+        if not tab.current_file:
+            return
+        settings = QSettings("WebForge", "WebForge")
+        value = settings.value(self.fold_state_key(tab.current_file), "")
+        lines = [int(line) for line in str(value).split(",") if line.strip().isdigit()]
+        tab.editor.restore_folds(lines)
+
+    def on_modification_changed(self, tab, modified):
+        tab.modified = modified
+        self.update_tab_label(tab)
+
+    def content_hash(self, content):
+        return hashlib.sha1(content.encode('utf-8')).digest()
+
+    def mark_saved(self, content, tab=None):
+        tab = tab if tab is not None else self.document_tab
+        tab.saved_hash = self.content_hash(content)
+        tab.editor.document().setModified(False)
+        tab.modified = False
+        if tab.current_file:
+            tab.journal.reset(tab.current_file, tab.saved_hash)
+        else:
+            tab.journal.reset(None, tab.saved_hash, text=content)
+
+    def on_document_change(self, tab, position, chars_removed, chars_added):
+        if tab.file_load is not None or not (chars_removed or chars_added):
+            return
+        text = ""
+        if chars_added:
+            document = tab.editor.document()
+            cursor = QTextCursor(document)
+            cursor.setPosition(position)
+            cursor.setPosition(min(position + chars_added, document.characterCount() - 1),
+                               QTextCursor.KeepAnchor)
+            text = cursor.selectedText().replace("\u2029", "\n")
+        tab.journal.record(position, chars_removed, text)
+        if not self.journal_timer.isActive():
+            self.journal_timer.start(2000)
+
+    def flush_journal(self):
+        for tab in self.document_tabs():
+            if tab.journal.needs_compaction():
+                tab.journal.reset(tab.current_file, tab.saved_hash, text=tab.editor.toPlainText())
+            else:
+                tab.journal.flush()
+
+    def offer_recovery(self):
+        for path, lock in RecoveryJournal.orphans(self.recovery_directory):
+            try:
+                recovered = RecoveryJournal.recover(path)
+            except (OSError, ValueError, KeyError, IndexError):
+                recovered = None
+            if recovered is not None:
+                file_path, text = recovered
+                name = os.path.basename(file_path) if file_path else "an untitled document"
+                reply = QMessageBox.question(self, 'Recover Unsaved Changes',
+                    f'WebForge closed unexpectedly with unsaved changes to {name}.\n'
+                    'Do you want to recover them?',
+                    QMessageBox.Yes | QMessageBox.No)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            lock.unlock()
+            if recovered is not None and reply == QMessageBox.Yes:
+                self.reusable_tab()
+                self.yaml_editor.setPlainText(text)
+                self.current_file = file_path
+                self.saved_hash = None
+                self.yaml_editor.document().setModified(True)
+                self.journal.reset(file_path, text=text)
+                self.set_document_title(os.path.basename(file_path) if file_path else "Untitled")
+                self.statusBar().showMessage("Recovered unsaved changes", 3000)
+
+    def has_unsaved_changes(self, tab=None):
+        tab = tab if tab is not None else self.document_tab
+        if tab.file_load is not None:
+            return False
+        # The document's modified flag follows the undo stack's clean index, so
+        # undoing back to the saved state clears it for free. Only when the
+        # flag is set is the content hashed, to catch edits that cancel out.
+        document = tab.editor.document()
+        if not document.isModified():
+            return False
+        if self.content_hash(tab.editor.toPlainText()) == tab.saved_hash:
+            document.setModified(False)
+            return False
+        return True
+
     def update_preview(self):
+        tab = self.document_tab
+        if tab.file_load is not None:
+            return
+        profile = RenderProfile() if self.render_profiling else None
+        yaml_text = tab.editor.toPlainText()
+        tab.render_revision = tab.editor.document().revision()
+        self.start_validation(tab, yaml_text)
+        publish = tab.server_key is not None
+        key = (self.content_hash(yaml_text), publish)
+        result = tab.cached_render(key)
+        if result is not None:
+            self.show_render(tab, result, profile)
+            return
+        
+        tab.render_generation += 1
+        generation = tab.render_generation
+        future = self.render_executor.submit(render_document, yaml_text, profile, publish)
+        future.add_done_callback(
+            lambda future: self.render_finished.emit(tab, generation, key, future, profile))
+
+    def on_render_finished(self, tab, generation, key, future, profile):
         try:
-            yaml_text = self.yaml_editor.toPlainText()
-            html_content, success = yaml_to_html(yaml_text)
+            result = future.result()
+        except Exception as e:
+            # Parse errors come back as results, so a render that raised had
+            # no syntax error to report
+            if tab.editor.document().revision() == tab.render_revision:
+                tab.syntax_diagnostics = []
+                if not self.validation_enabled:
+                    self.apply_diagnostics(tab, [])
+            if tab is self.document_tab:
+                self.show_preview_error(e)
+            return
+        tab.store_render(key, result)
+        if tab is self.document_tab and generation == tab.render_generation:
+            self.show_render(tab, result, profile)
+
+    def show_render(self, tab, result, profile=None):
+        try:
+            html_content, success, outline, source_map, published, syntax_diagnostics = result
+            # Without the validator, syntax errors come from the render's own
+            # parse, as long as they still describe the text in the editor
+            if tab.editor.document().revision() == tab.render_revision:
+                tab.syntax_diagnostics = syntax_diagnostics
+                if not self.validation_enabled:
+                    self.apply_diagnostics(tab, syntax_diagnostics)
+            if source_map is not None:
+                tab.source_map = source_map
+            if outline is not None:
+                tab.outline = outline
+                self.outline_model.update_outline(outline)
             
-            temp_html = os.path.join(os.getcwd(), 'temp_preview.html')
-            with open(temp_html, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # A document that stops parsing keeps its last good page on screen;
+            # the editor's squiggles say what is wrong with it.
+            if not success and tab.last_good_html is not None:
+                if self.displayed_html != tab.last_good_html or self.preview_tab is not tab:
+                    self.load_preview_html(tab.last_good_html, profile, tab)
+                self.statusBar().showMessage("YAML error — showing the last good preview", 3000)
+                return
+            if success:
+                tab.last_good_html = html_content
             
-            self.preview_area.load(QUrl.fromLocalFile(temp_html))
+            self.load_preview_html(html_content, profile, tab)
+            if tab.server_key is not None and published is not None:
+                self.preview_server.publish(tab.server_key, *published)
             
             if success:
                 self.statusBar().showMessage("Preview updated successfully", 3000)
@@ -858,7 +2479,145 @@ class YAMLPreviewApp(QMainWindow):
                 self.statusBar().showMessage("Preview updated with errors", 3000)
                 
         except Exception as e:
-            error_html = f"""<!DOCTYPE html>
+            self.show_preview_error(e)
+
+    def start_validation(self, tab, yaml_text):
+        if not self.validation_enabled:
+            return
+        tab.validation_generation += 1
+        tab.validation_revision = tab.editor.document().revision()
+        generation = tab.validation_generation
+        future = self.validate_executor.submit(tab.validator.validate, yaml_text)
+        future.add_done_callback(
+            lambda future: self.validation_finished.emit(tab, generation, future))
+
+    def on_validation_finished(self, tab, generation, future):
+        if generation != tab.validation_generation or not self.validation_enabled:
+            return
+        # Positions refer to the text that was validated; after further edits
+        # the next refresh brings fresh ones.
+        if tab.editor.document().revision() != tab.validation_revision:
+            return
+        try:
+            diagnostics = future.result()
+        except Exception as e:
+            self.statusBar().showMessage(f"Validation failed: {str(e)}", 5000)
+            return
+        self.apply_diagnostics(tab, diagnostics)
+
+    def apply_diagnostics(self, tab, diagnostics):
+        tab.diagnostics = diagnostics
+        tab.editor.set_diagnostics(diagnostics)
+        if tab is self.document_tab:
+            self.show_diagnostics(tab)
+
+    def show_diagnostics(self, tab):
+        if not tab.diagnostics:
+            self.diagnostics_label.hide()
+            return
+        errors = sum(1 for diagnostic in tab.diagnostics if diagnostic.severity == "error")
+        warnings = len(tab.diagnostics) - errors
+        parts = []
+        if errors:
+            parts.append(f"{errors} error{'s' if errors != 1 else ''}")
+        if warnings:
+            parts.append(f"{warnings} warning{'s' if warnings != 1 else ''}")
+        self.diagnostics_label.setText(", ".join(parts))
+        lines = [f"Line {diagnostic.line + 1}:{diagnostic.column + 1}  {diagnostic.message}"
+                 for diagnostic in tab.diagnostics[:20]]
+        if len(tab.diagnostics) > 20:
+            lines.append(f"... and {len(tab.diagnostics) - 20} more")
+        self.diagnostics_label.setToolTip("\n".join(lines))
+        self.diagnostics_label.show()
+
+    def set_validation_enabled(self, enabled):
+        self.validation_enabled = enabled
+        QSettings("WebForge", "WebForge").setValue("editor/validate", enabled)
+        for tab in self.document_tabs():
+            tab.validation_generation += 1
+            self.apply_diagnostics(tab, [] if enabled else tab.syntax_diagnostics)
+        if self.document_tab.file_load is None:
+            self.start_validation(self.document_tab, self.yaml_editor.toPlainText())
+
+    def load_preview_html(self, html_content, profile=None, tab=None):
+        if self.preview_area is None:
+            self.preview_pending = True
+            return
+        
+        # Reloading starts the page at the top, so the offset is put back once
+        # the new page has loaded. While a page is still loading it has no
+        # offset of its own yet and the one saved before stays.
+        if self.preview_tab is not None and not self.preview_loading:
+            self.preview_tab.preview_scroll = self.preview_area.page().scrollPosition()
+        self.preview_tab = tab
+        self.preview_loading = True
+        self.displayed_html = html_content
+        temp_html = os.path.join(os.getcwd(), 'temp_preview.html')
+        with phase(profile, "write"):
+            with open(temp_html, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+        
+        # A profile whose page is still loading when the next one starts is
+        # recorded without its load phase.
+        self.finish_render_profile()
+        if profile is not None:
+            self.loading_profile = (profile, time.perf_counter())
+        self.highlighted_component = None
+        self.preview_area.load(QUrl.fromLocalFile(temp_html))
+
+    def on_preview_loaded(self, ok):
+        self.preview_loading = False
+        tab = self.preview_tab
+        if tab is not None and tab.preview_scroll is not None:
+            self.preview_area.page().runJavaScript(
+                "window.scrollTo(%r, %r);" % (tab.preview_scroll.x(), tab.preview_scroll.y()))
+        if self.scroll_sync_enabled:
+            self.scroll_sync_timer.start()
+        self.highlight_source_component(self.document_tab)
+        if self.loading_profile is not None:
+            profile, started = self.loading_profile
+            profile.add_phase("load", started, time.perf_counter())
+            self.finish_render_profile()
+
+    def finish_render_profile(self):
+        if self.loading_profile is None:
+            return
+        profile = self.loading_profile[0]
+        self.loading_profile = None
+        self.render_profiles.append(profile)
+        if self.render_profiling:
+            self.profile_label.setText(profile.summary())
+            self.profile_label.setToolTip("\n".join(
+                f"{component_type}: {profile.component_counts[component_type]} rendered, {seconds * 1000:.2f} ms"
+                for component_type, seconds in sorted(profile.component_seconds.items(),
+                                                     key=lambda item: item[1], reverse=True)))
+
+    def set_render_profiling(self, enabled):
+        self.render_profiling = enabled
+        self.profile_label.setText("Refresh the preview to profile it")
+        self.profile_label.setToolTip("")
+        self.profile_label.setVisible(enabled)
+        if enabled:
+            self.update_preview()
+
+    def export_render_trace(self):
+        if not self.render_profiles:
+            QMessageBox.information(self, "Export Render Trace",
+                "No render profiles recorded yet. Turn on Preview > Render Profiling and edit the document first.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Render Trace", "webforge-trace.json",
+                                                   "Trace Files (*.json);;All Files (*)")
+        if not file_path:
+            return
+        try:
+            write_chrome_trace(self.render_profiles, file_path)
+            self.statusBar().showMessage(
+                f"Exported {len(self.render_profiles)} render profiles to {file_path}", 3000)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to export trace: {str(e)}")
+
+    def show_preview_error(self, e):
+        error_html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -910,14 +2669,10 @@ class YAMLPreviewApp(QMainWindow):
     </div>
 </body>
 </html>"""
-            
-            temp_html = os.path.join(os.getcwd(), 'temp_preview.html')
-            with open(temp_html, 'w', encoding='utf-8') as f:
-                f.write(error_html)
-            
-            self.preview_area.load(QUrl.fromLocalFile(temp_html))
-            
-            self.statusBar().showMessage(f"Error updating preview: {str(e)}", 5000)
+        
+        self.load_preview_html(error_html)
+        
+        self.statusBar().showMessage(f"Error updating preview: {str(e)}", 5000)
 
     def export_html(self):
         try:
@@ -957,146 +2712,29 @@ class YAMLPreviewApp(QMainWindow):
             self.statusBar().showMessage(f"Export failed: {str(e)}", 5000)
 
     def view_html(self):
-        yaml_text = self.yaml_editor.toPlainText().strip()
+        yaml_text = self.yaml_editor.toPlainText()
         
-        if not yaml_text:
+        if not yaml_text.strip():
             QMessageBox.information(self, "Empty Editor", 
                                   "The editor is empty. Please add some YAML content or load an example first.")
             self.statusBar().showMessage("Editor is empty - nothing to view", 3000)
             return
         
-        html, success = yaml_to_html(yaml_text)
-        
-        if not success:
+        try:
+            data, root_node = parse_yaml(yaml_text)
+        except yaml.YAMLError:
             QMessageBox.warning(self, "View HTML Error", 
                               "Cannot view invalid YAML. Please fix the errors first.")
             return
-        try:
-            from html.parser import HTMLParser
-            from html.entities import entitydefs
-            import re
-
-            class HTMLFormatter(HTMLParser):
-                def __init__(self):
-                    super().__init__()
-                    self.formatted = []
-                    self.indent_level = 0
-                    self.indent_size = 2
-                    self.in_tag = False
-                    self.last_tag = None
-                    self.current_data = []
-
-                def handle_starttag(self, tag, attrs):
-                    # Process any pending data
-                    if self.current_data:
-                        data = ''.join(self.current_data).strip()
-                        if data:
-                            indent = ' ' * (self.indent_level * self.indent_size)
-                            self.formatted.append(f'{indent}{data}')
-                        self.current_data = []
-
-                    indent = ' ' * (self.indent_level * self.indent_size)
-                    attrs_str = ' '.join(f'{k}="{v}"' for k, v in attrs)
-                    if attrs_str:
-                        self.formatted.append(f'{indent}<{tag} {attrs_str}>')
-                    else:
-                        self.formatted.append(f'{indent}<{tag}>')
-                    self.indent_level += 1
-                    self.in_tag = True
-                    self.last_tag = tag
-
-                def handle_endtag(self, tag):
-                    # Process any pending data
-                    if self.current_data:
-                        data = ''.join(self.current_data).strip()
-                        if data:
-                            indent = ' ' * (self.indent_level * self.indent_size)
-                            self.formatted.append(f'{indent}{data}')
-                        self.current_data = []
-
-                    self.indent_level -= 1
-                    indent = ' ' * (self.indent_level * self.indent_size)
-                    if self.in_tag and self.last_tag == tag:
-                        # If the tag was empty, modify the previous line
-                        self.formatted[-1] = self.formatted[-1].replace('>', f'</{tag}>')
-                    else:
-                        self.formatted.append(f'{indent}</{tag}>')
-                    self.in_tag = False
-
-                def handle_data(self, data):
-                    if data.strip():
-                        self.current_data.append(data)
-
-                def handle_entityref(self, name):
-                    if name in entitydefs:
-                        self.current_data.append(entitydefs[name])
-                    else:
-                        self.current_data.append(f'&{name};')
-
-                def handle_charref(self, name):
-                    if name.startswith('x'):
-                        self.current_data.append(chr(int(name[1:], 16)))
-                    else:
-                        self.current_data.append(chr(int(name)))
-
-                def get_formatted_html(self):
-                    # Process any remaining data
-                    if self.current_data:
-                        data = ''.join(self.current_data).strip()
-                        if data:
-                            indent = ' ' * (self.indent_level * self.indent_size)
-                            self.formatted.append(f'{indent}{data}')
-                    
-                    # Clean up the formatted HTML
-                    formatted = '\n'.join(self.formatted)
-                    # Remove any double newlines
-                    formatted = re.sub(r'\n\s*\n', '\n', formatted)
-                    # Remove any trailing whitespace
-                    formatted = re.sub(r'[ \t]+$', '', formatted, flags=re.MULTILINE)
-                    
-                    if '<head>' in formatted:
-                        css_reset = """
-        <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            html, body {
-                margin: 0;
-                padding: 0;
-                width: 100%;
-                height: 100%;
-                overflow-x: hidden;
-                background-color: #f5f5f0;
-            }
-            body > *:first-child {
-                margin-top: 0 !important;
-                padding-top: 0 !important;
-            }
-            section {
-                display: block;
-                width: 100%;
-            }
-        </style>"""
-                        formatted = formatted.replace('<head>', '<head>' + css_reset)
-                    
-                    if '<body' in formatted:
-                        formatted = re.sub(r'<body[^>]*style="[^"]*"', 
-                                         lambda m: re.sub(r'margin:\s*[^;]+;|padding:\s*[^;]+;', '', m.group(0)), 
-                                         formatted)
-                        if 'style=' not in formatted:
-                            formatted = formatted.replace('<body', '<body style="margin: 0; padding: 0;"')
-                        elif 'margin:' not in formatted and 'padding:' not in formatted:
-                            formatted = formatted.replace('style="', 'style="margin: 0; padding: 0; ')
-                    
-                    return formatted
-
-            formatter = HTMLFormatter()
-            formatter.feed(html)
-            formatted_html = formatter.get_formatted_html()
-        except Exception:
-            formatted_html = html
+        
+        component_lines = []
+        formatted_html = render_page(data, pretty=True, component_lines=component_lines)
+        cursor_line = self.yaml_editor.textCursor().blockNumber()
+        target_line = None
+        for index, entry in enumerate(self.flatten_outline(build_outline(root_node))):
+            if entry["line"] > cursor_line:
+                break
+            target_line = component_lines[index]
         
         dialog = QDialog(self)
         dialog.setWindowTitle("Generated HTML")
@@ -1107,18 +2745,14 @@ class YAMLPreviewApp(QMainWindow):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(10)
         
-        text_edit = QTextEdit()
-        text_edit.setPlainText(formatted_html)
-        text_edit.setReadOnly(True)
+        text_edit = HTMLSourceView()
         font = text_edit.font()
         font.setFamily("Consolas")
         font.setPointSize(10)
         text_edit.setFont(font)
         
-        HTMLHighlighter(text_edit.document())
-        
         text_edit.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1a1a1a;
                 color: #e0e0e0;
                 border: 1px solid #404040;
@@ -1154,20 +2788,16 @@ class YAMLPreviewApp(QMainWindow):
         
         layout.addLayout(button_layout)
         
+        text_edit.set_source(formatted_html, target_line)
         dialog.exec()
+        text_edit.load_timer.stop()
 
-    def open_file(self):
-        if self.modified:
-            reply = QMessageBox.question(self, 'Open File',
-                'Do you want to save the current file before opening a new one?',
-                QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
-            
-            if reply == QMessageBox.Save:
-                if not self.save_file():
-                    return
-            elif reply == QMessageBox.Cancel:
-                return
+    def flatten_outline(self, entries):
+        for entry in entries:
+            yield entry
+            yield from self.flatten_outline(entry["children"])
 
+    def open_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Open YAML File",
@@ -1176,59 +2806,146 @@ class YAMLPreviewApp(QMainWindow):
         )
 
         if file_path:
+            for tab in self.document_tabs():
+                if tab.current_file and os.path.abspath(tab.current_file) == os.path.abspath(file_path):
+                    self.tabs.setCurrentWidget(tab)
+                    return
+            previous_tab = self.document_tab
+            tab = self.reusable_tab()
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    self.yaml_editor.setPlainText(content)
-                    self.initial_content = content
-                    self.current_file = file_path
-                    self.modified = False
-                    self.setWindowTitle(f"WebForge - {os.path.basename(file_path)}")
-                    self.statusBar().showMessage(f"File opened: {file_path}", 3000)
-                    self.update_preview()
+                self.load_file(file_path, tab is not previous_tab)
             except Exception as e:
+                self.discard_opened_tab(tab, tab is not previous_tab)
                 QMessageBox.critical(self, "Error",
                     f"Failed to open file: {str(e)}")
                 self.statusBar().showMessage(f"Error opening file: {str(e)}", 5000)
-
-    def new_file(self):
-        if self.modified:
-            reply = QMessageBox.question(self, 'New File',
-                'Do you want to save the current file before creating a new one?',
-                QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
-            
-            if reply == QMessageBox.Save:
-                if not self.save_file():
-                    return
-            elif reply == QMessageBox.Cancel:
                 return
+
+    def discard_opened_tab(self, tab, new_tab):
+        # A tab opened just for a file that could not be read is closed again;
+        # a reused blank tab is put back the way it was
+        self.cancel_file_load(tab)
+        tab.editor.clear()
+        tab.current_file = None
+        self.mark_saved("", tab)
+        self.set_document_title("Untitled", tab)
+        if new_tab:
+            self.close_tab(self.tabs.indexOf(tab))
+
+    def load_file(self, file_path, new_tab=False):
+        # The file is mapped and appended to the document a chunk at a time
+        # from the event loop, so the first screen is shown straight away.
+        # The editor stays read-only and the preview waits until it is done.
+        tab = self.document_tab
+        self.cancel_file_load(tab)
+        with open(file_path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        
+        self.save_fold_state(tab)
+        self.preview_timer.stop()
+        tab.file_load = {
+            "path": file_path,
+            "data": data,
+            "position": 0,
+            "decoder": codecs.getincrementaldecoder('utf-8')(),
+            "new_tab": new_tab,
+        }
+        document = tab.editor.document()
+        document.setUndoRedoEnabled(False)
+        tab.editor.clear()
+        tab.editor.setReadOnly(True)
+        tab.file_load["revision"] = document.revision()
+        tab.file_load["edited"] = False
+        tab.current_file = file_path
+        self.set_document_title(os.path.basename(file_path), tab)
+        self.load_progress.setRange(0, max(1, len(data)))
+        self.load_progress.setValue(0)
+        
+        self.load_next_file_chunk(tab)
+        if tab.file_load is not None:
+            self.load_progress.show()
+            self.statusBar().showMessage(f"Loading {file_path}...")
+            tab.load_timer.start(0)
+
+    def load_next_file_chunk(self, tab):
+        load = tab.file_load
+        data = load["data"]
+        start = load["position"]
+        end = data.find(b"\n", start + FILE_LOAD_CHUNK_SIZE) + 1 or len(data)
+        final = end >= len(data)
+        try:
+            text = load["decoder"].decode(data[start:end], final)
+        except UnicodeDecodeError as e:
+            self.discard_opened_tab(tab, load["new_tab"])
+            QMessageBox.critical(self, "Error", f"Failed to open file: {str(e)}")
+            self.statusBar().showMessage(f"Error opening file: {str(e)}", 5000)
+            return
         
-        self.yaml_editor.clear()
-        self.current_file = None
-        self.initial_content = ""
-        self.modified = False
-        self.setWindowTitle("WebForge - Untitled")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        document = tab.editor.document()
+        if document.revision() != load["revision"]:
+            load["edited"] = True
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        load["revision"] = document.revision()
+        load["position"] = end
+        if tab is self.document_tab:
+            self.load_progress.setValue(end)
+        
+        if final:
+            self.finish_file_load(tab)
+
+    def finish_file_load(self, tab):
+        file_path = tab.file_load["path"]
+        edited = tab.file_load["edited"] or tab.editor.document().revision() != tab.file_load["revision"]
+        self.cancel_file_load(tab)
+        if edited:
+            # Anything that changed the document besides the loader itself is
+            # kept as an unsaved change rather than silently marked clean
+            tab.saved_hash = None
+            tab.editor.document().setModified(True)
+            tab.journal.reset(None, text=tab.editor.toPlainText())
+        else:
+            self.mark_saved(tab.editor.toPlainText(), tab)
+        self.restore_fold_state(tab)
+        self.statusBar().showMessage(f"File opened: {file_path}", 3000)
+        if tab is self.document_tab:
+            self.preview_timer.start(0)
+
+    def cancel_file_load(self, tab=None):
+        tab = tab if tab is not None else self.document_tab
+        if tab.file_load is None:
+            return
+        tab.load_timer.stop()
+        if isinstance(tab.file_load["data"], mmap.mmap):
+            tab.file_load["data"].close()
+        tab.file_load = None
+        if tab is self.document_tab:
+            self.load_progress.hide()
+        tab.editor.setReadOnly(False)
+        tab.editor.document().setUndoRedoEnabled(True)
+
+    def new_file(self):
+        self.new_tab()
         self.statusBar().showMessage("New file created", 3000)
 
-    def save_file(self):
+    def save_file(self, wait=False):
+        if self.file_load is not None:
+            self.statusBar().showMessage("Wait for the file to finish loading before saving", 3000)
+            return False
         if not self.current_file:
             return self.save_file_as()
         
-        try:
-            content = self.yaml_editor.toPlainText()
-            with open(self.current_file, 'w', encoding='utf-8') as file:
-                file.write(content)
-            self.initial_content = content
-            self.modified = False
-            self.statusBar().showMessage(f"File saved: {self.current_file}", 3000)
-            return True
-        except Exception as e:
-            QMessageBox.critical(self, "Error",
-                f"Failed to save file: {str(e)}")
-            self.statusBar().showMessage(f"Error saving file: {str(e)}", 5000)
-            return False
+        self.start_save(self.current_file)
+        return self.wait_for_saves() if wait else True
 
     def save_file_as(self):
+        if self.file_load is not None:
+            self.statusBar().showMessage("Wait for the file to finish loading before saving", 3000)
+            return False
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Save YAML File",
@@ -1236,39 +2953,93 @@ class YAMLPreviewApp(QMainWindow):
             "YAML Files (*.yaml *.yml);;All Files (*.*)"
         )
 
-        if file_path:
-            try:
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(self.yaml_editor.toPlainText())
-                self.current_file = file_path
-                self.modified = False
-                self.setWindowTitle(f"WebForge - {os.path.basename(file_path)}")
-                self.statusBar().showMessage(f"File saved: {file_path}", 3000)
-                return True
-            except Exception as e:
-                QMessageBox.critical(self, "Error",
-                    f"Failed to save file: {str(e)}")
-                self.statusBar().showMessage(f"Error saving file: {str(e)}", 5000)
-                return False
-        return False
+        if not file_path:
+            return False
+        # The tab only takes the new name once the file has been written, so
+        # a failed write leaves later saves going where they went before
+        tab = self.document_tab
+        self.start_save(file_path)
+        if not self.wait_for_saves():
+            return False
+        tab.current_file = file_path
+        self.set_document_title(os.path.basename(file_path), tab)
+        tab.journal.reset(file_path, tab.saved_hash)
+        self.save_fold_state(tab)
+        return True
+
+    def start_save(self, file_path):
+        # The document is snapshotted and marked clean here, so typing can
+        # carry on while the worker writes; a failed write restores the flag.
+        tab = self.document_tab
+        content = tab.editor.toPlainText()
+        self.save_count += 1
+        tab.last_save_id = self.save_count
+        tab.save_failed = False
+        previous_hash = tab.saved_hash
+        self.mark_saved(content, tab)
+        self.statusBar().showMessage(f"Saving {file_path}...")
+        future = self.save_executor.submit(
+            self.write_in_background, self.save_count, file_path, content, self.fsync_mode)
+        self.pending_saves[self.save_count] = (tab, previous_hash, future)
+
+    def write_in_background(self, save_id, file_path, content, fsync_mode):
+        try:
+            write_file_atomic(file_path, content, fsync_mode)
+            error = ""
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        self.save_finished.emit(save_id, file_path, error)
+        return save_id, file_path, error
+
+    def on_save_finished(self, save_id, file_path, error):
+        if save_id not in self.pending_saves:
+            return
+        tab, previous_hash, _ = self.pending_saves.pop(save_id)
+        tab.save_failed = bool(error)
+        if error:
+            if save_id == tab.last_save_id:
+                tab.saved_hash = previous_hash
+            tab.editor.document().setModified(True)
+            tab.journal.reset(tab.current_file, tab.saved_hash, text=tab.editor.toPlainText())
+            QMessageBox.critical(self, "Error",
+                f"Failed to save file: {error}")
+            self.statusBar().showMessage(f"Error saving file: {error}", 5000)
+        else:
+            self.save_fold_state(tab)
+            self.statusBar().showMessage(f"File saved: {file_path}", 3000)
+
+    def wait_for_saves(self, tab=None):
+        # Used where the caller must know the outcome, e.g. before replacing
+        # or closing the document: blocks until the queued writes are done
+        # and handles their results now instead of via the queued signal.
+        tab = tab if tab is not None else self.document_tab
+        for save_id in sorted(self.pending_saves):
+            if save_id in self.pending_saves and self.pending_saves[save_id][0] is tab:
+                self.on_save_finished(*self.pending_saves[save_id][2].result())
+        return not tab.save_failed
+
+    def set_fsync_mode(self, mode):
+        self.fsync_mode = mode
+        QSettings("WebForge", "WebForge").setValue("save/fsync", mode)
 
     def closeEvent(self, event):
-        if self.modified:
-            reply = QMessageBox.question(self, 'Save Changes',
-                'Do you want to save your changes before closing?',
-                QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
-            
-            if reply == QMessageBox.Save:
-                if not self.save_file():
-                    event.ignore()
-                    return
-            elif reply == QMessageBox.Cancel:
+        for tab in self.document_tabs():
+            if not self.confirm_close_document(tab):
                 event.ignore()
                 return
         
+        for tab in self.document_tabs():
+            self.release_tab(tab)
+        self.save_executor.shutdown()
+        self.render_executor.shutdown(wait=False)
+        self.validate_executor.shutdown(wait=False)
+        if self.preview_server is not None:
+            self.preview_server.stop()
         event.accept()
 
     def setup_javascript_bridge(self):
+        from PyQt5.QtWebChannel import QWebChannel
+        
         class WebForgeBridge(QObject):
             def __init__(self, parent):
                 super().__init__()
@@ -1277,6 +3048,10 @@ class YAMLPreviewApp(QMainWindow):
             @pyqtSlot()
             def loadExample(self):
                 self.parent.load_example_yaml()
+            
+            @pyqtSlot(int)
+            def revealSource(self, component):
+                self.parent.reveal_source(component)
         
         self.bridge = WebForgeBridge(self)
         self.channel = QWebChannel()
@@ -1285,16 +3060,6 @@ class YAMLPreviewApp(QMainWindow):
 
     def load_example_yaml(self):
         try:
-            if self.modified:
-                reply = QMessageBox.question(self, 'Load Example',
-                    'Do you want to save the current file before loading the example?',
-                    QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
-                
-                if reply == QMessageBox.Save:
-                    if not self.save_file():
-                        return
-                elif reply == QMessageBox.Cancel:
-                    return
             example_content = """title: Earth & Soul
 
 body:
@@ -1549,11 +3314,10 @@ body:
                 white-space: "nowrap"
 """
             
+            self.reusable_tab()
             self.yaml_editor.setPlainText(example_content)
-            self.initial_content = example_content
-            self.current_file = None
-            self.modified = False
-            self.setWindowTitle("WebForge - Earth & Soul Example")
+            self.mark_saved(example_content)
+            self.set_document_title("Earth & Soul Example")
             self.statusBar().showMessage("Nature example loaded successfully", 3000)
             
             self.update_preview()
@@ -1567,14 +3331,18 @@ body:
         try:
             readme_file = os.path.join(os.getcwd(), 'README.md')
             if os.path.exists(readme_file):
-                with open(readme_file, 'r', encoding='utf-8') as f:
-                    readme_content = f.read()
-                
-                html_content = self.markdown_to_html(readme_content)
-                
                 docs_html = os.path.join(os.getcwd(), 'temp_docs.html')
-                with open(docs_html, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
+                stat = os.stat(readme_file)
+                readme_stamp = (readme_file, stat.st_mtime_ns, stat.st_size)
+                if readme_stamp != self.docs_readme_stamp or not os.path.exists(docs_html):
+                    with open(readme_file, 'rb') as f:
+                        readme_bytes = f.read()
+                    if not self.docs_cache_valid(docs_html, readme_bytes):
+                        html_content = self.markdown_to_html(readme_bytes.decode('utf-8'))
+                        with open(docs_html, 'w', encoding='utf-8') as f:
+                            f.write(self.docs_cache_header(readme_bytes))
+                            f.write(html_content)
+                    self.docs_readme_stamp = readme_stamp
                 
                 import webbrowser
                 webbrowser.open('file://' + os.path.abspath(docs_html))
@@ -1589,26 +3357,48 @@ body:
                 f"Failed to open documentation: {str(e)}")
             self.statusBar().showMessage(f"Error opening documentation: {str(e)}", 5000)
     
+    def docs_cache_header(self, readme_bytes):
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            markdown_version = version('markdown')
+        except PackageNotFoundError:
+            markdown_version = 'unknown'
+        digest = hashlib.sha1(readme_bytes)
+        digest.update(markdown_version.encode('utf-8'))
+        digest.update(str(getattr(self, 'logo_png_path', '')).encode('utf-8'))
+        return f"<!-- webforge-docs {digest.hexdigest()} -->\n"
+    
+    def docs_cache_valid(self, docs_html, readme_bytes):
+        try:
+            with open(docs_html, 'r', encoding='utf-8') as f:
+                cached_header = f.readline()
+        except OSError:
+            return False
+        return cached_header == self.docs_cache_header(readme_bytes)
+    
     def markdown_to_html(self, markdown_content):
-        md = markdown.Markdown(
-            extensions=[
-                'codehilite',
-                'fenced_code',
-                'tables',
-                'toc',
-                'nl2br',
-                'attr_list',
-                'def_list',
-                'footnotes',
-                'md_in_html',
-            ],
-            extension_configs={
-                'codehilite': {
-                    'css_class': 'highlight',
-                    'use_pygments': False,
+        if self.markdown_converter is None:
+            import markdown
+            self.markdown_converter = markdown.Markdown(
+                extensions=[
+                    'codehilite',
+                    'fenced_code',
+                    'tables',
+                    'toc',
+                    'nl2br',
+                    'attr_list',
+                    'def_list',
+                    'footnotes',
+                    'md_in_html',
+                ],
+                extension_configs={
+                    'codehilite': {
+                        'css_class': 'highlight',
+                        'use_pygments': False,
+                    }
                 }
-            }
-        )
+            )
+        md = self.markdown_converter.reset()
         
         html_content = md.convert(markdown_content)
         
@@ -1917,7 +3707,7 @@ body:
     def show_replace_dialog(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Find and Replace")
-        dialog.setFixedSize(500, 320)
+        dialog.setFixedSize(500, 360)
         dialog.setWindowFlags(dialog.windowFlags() & ~Qt.WindowContextHelpButtonHint)
         
         layout = QVBoxLayout(dialog)
@@ -1968,6 +3758,11 @@ body:
         """)
         layout.addWidget(replace_input)
         
+        regex_checkbox = QCheckBox("Regular expression")
+        regex_checkbox.setStyleSheet("color: #e0e0e0;")
+        regex_checkbox.setToolTip("Use Python regex syntax; refer to groups as \\1 or \\g<name> in the replacement")
+        layout.addWidget(regex_checkbox)
+        
         match_label = QLabel("")
         match_label.setStyleSheet("color: #4dabf7; font-size: 12px; font-style: italic;")
         match_label.setWordWrap(True)
@@ -1992,7 +3787,7 @@ body:
                 background-color: #339af0;
             }
         """)
-        find_btn.clicked.connect(lambda: self.find_text_with_counter(find_input.text(), dialog, match_label))
+        find_btn.clicked.connect(lambda: self.find_text_with_counter(find_input.text(), dialog, match_label, regex_checkbox.isChecked()))
         
         replace_btn = QPushButton("Replace")
         replace_btn.setMinimumHeight(35)
@@ -2011,7 +3806,7 @@ body:
                 background-color: #218838;
             }
         """)
-        replace_btn.clicked.connect(lambda: self.replace_text_with_counter(find_input.text(), replace_input.text(), dialog, match_label))
+        replace_btn.clicked.connect(lambda: self.replace_text_with_counter(find_input.text(), replace_input.text(), dialog, match_label, regex_checkbox.isChecked()))
         
         replace_all_btn = QPushButton("Replace All")
         replace_all_btn.setMinimumHeight(35)
@@ -2030,7 +3825,7 @@ body:
                 background-color: #c82333;
             }
         """)
-        replace_all_btn.clicked.connect(lambda: self.replace_all_text_with_counter(find_input.text(), replace_input.text(), dialog, match_label))
+        replace_all_btn.clicked.connect(lambda: self.replace_all_text_with_counter(find_input.text(), replace_input.text(), dialog, match_label, regex_checkbox.isChecked()))
         
         close_btn = QPushButton("Close")
         close_btn.setMinimumHeight(35)
@@ -2085,8 +3880,14 @@ body:
             else:
                 self.statusBar().showMessage(f'Text "{search_text}" not found.', 3000)
 
+    def replace_blocked(self):
+        if self.file_load is None:
+            return False
+        self.statusBar().showMessage("Wait for the file to finish loading before replacing", 3000)
+        return True
+
     def replace_text(self, search_text, replace_text, dialog=None):
-        if not search_text.strip():
+        if not search_text.strip() or self.replace_blocked():
             return
         
         cursor = self.yaml_editor.textCursor()
@@ -2102,12 +3903,10 @@ body:
                 self.statusBar().showMessage("Text replaced", 2000)
 
     def replace_all_text(self, search_text, replace_text, dialog=None):
-        if not search_text.strip():
+        if not search_text.strip() or self.replace_blocked():
             return
         
-        full_text = self.yaml_editor.toPlainText()
-        
-        count = full_text.count(search_text)
+        count = self.yaml_editor.replace_all(search_text, replace_text)
         
         if count == 0:
             if dialog:
@@ -2116,20 +3915,27 @@ body:
                 self.statusBar().showMessage(f'Text "{search_text}" not found.', 3000)
             return
         
-        new_text = full_text.replace(search_text, replace_text)
-        self.yaml_editor.setPlainText(new_text)
-        
         if dialog:
             QMessageBox.information(dialog, "Replace All", f'Replaced {count} occurrence(s) of "{search_text}".')
         else:
             self.statusBar().showMessage(f'Replaced {count} occurrence(s)', 3000)
 
-    def find_text_with_counter(self, search_text, dialog=None, match_label=None):
+    def show_pattern_error(self, error, dialog=None):
+        if dialog:
+            QMessageBox.warning(dialog, "Invalid Pattern", f"Invalid regular expression: {str(error)}")
+        else:
+            self.statusBar().showMessage(f"Invalid regular expression: {str(error)}", 3000)
+
+    def find_text_with_counter(self, search_text, dialog=None, match_label=None, use_regex=False):
         if not search_text.strip():
             if match_label:
                 match_label.setText("")
             return
         
+        if use_regex:
+            self.find_regex_with_counter(search_text, dialog, match_label)
+            return
+        
         full_text = self.yaml_editor.toPlainText()
         total_matches = full_text.count(search_text)
         
@@ -2167,8 +3973,42 @@ body:
             if match_label:
                 match_label.setText("No matches found")
 
-    def replace_text_with_counter(self, search_text, replace_text, dialog=None, match_label=None):
-        if not search_text.strip():
+    def find_regex_with_counter(self, pattern, dialog=None, match_label=None):
+        try:
+            matches = [m for m in self.yaml_editor.find_matches(pattern, use_regex=True) if m[1] > m[0]]
+        except re.error as e:
+            self.show_pattern_error(e, dialog)
+            return None
+        
+        if not matches:
+            if match_label:
+                match_label.setText("No matches found")
+            if dialog:
+                QMessageBox.information(dialog, "Not Found", f'Pattern "{pattern}" not found.')
+            else:
+                self.statusBar().showMessage(f'Pattern "{pattern}" not found.', 3000)
+            return None
+        
+        position = self.yaml_editor.textCursor().position()
+        index = next((i for i, (start, _, _) in enumerate(matches) if start >= position), 0)
+        start, end, match = matches[index]
+        
+        cursor = self.yaml_editor.textCursor()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        self.yaml_editor.setTextCursor(cursor)
+        self.yaml_editor.setFocus()
+        
+        if match_label:
+            match_label.setText(f"Match {index + 1} of {len(matches)}")
+        return match
+
+    def replace_text_with_counter(self, search_text, replace_text, dialog=None, match_label=None, use_regex=False):
+        if not search_text.strip() or self.replace_blocked():
+            return
+        
+        if use_regex:
+            self.replace_regex_with_counter(search_text, replace_text, dialog, match_label)
             return
         
         cursor = self.yaml_editor.textCursor()
@@ -2185,13 +4025,35 @@ body:
                 self.statusBar().showMessage("Text replaced", 2000)
                 self.find_text_with_counter(search_text, dialog, match_label)
 
-    def replace_all_text_with_counter(self, search_text, replace_text, dialog=None, match_label=None):
-        if not search_text.strip():
+    def replace_regex_with_counter(self, pattern, replace_text, dialog=None, match_label=None):
+        cursor = self.yaml_editor.textCursor()
+        if cursor.hasSelection():
+            cursor.setPosition(cursor.selectionStart())
+            self.yaml_editor.setTextCursor(cursor)
+        
+        match = self.find_regex_with_counter(pattern, dialog, match_label)
+        if match is None:
             return
         
-        full_text = self.yaml_editor.toPlainText()
+        try:
+            replacement = match.expand(replace_text)
+        except (re.error, IndexError) as e:
+            self.show_pattern_error(e, dialog)
+            return
+        
+        self.yaml_editor.textCursor().insertText(replacement)
+        self.statusBar().showMessage("Text replaced", 2000)
+        self.find_regex_with_counter(pattern, dialog, match_label)
+
+    def replace_all_text_with_counter(self, search_text, replace_text, dialog=None, match_label=None, use_regex=False):
+        if not search_text.strip() or self.replace_blocked():
+            return
         
-        count = full_text.count(search_text)
+        try:
+            count = self.yaml_editor.replace_all(search_text, replace_text, use_regex)
+        except (re.error, IndexError) as e:
+            self.show_pattern_error(e, dialog)
+            return
         
         if count == 0:
             if match_label:
@@ -2202,9 +4064,6 @@ body:
                 self.statusBar().showMessage(f'Text "{search_text}" not found.', 3000)
             return
         
-        new_text = full_text.replace(search_text, replace_text)
-        self.yaml_editor.setPlainText(new_text)
-        
         if match_label:
             match_label.setText(f"Replaced {count} occurrence(s)")
         
@@ -2350,30 +4209,47 @@ body:
                 self.statusBar().showMessage("Editor is empty - nothing to preview", 3000)
                 return
             
-            html_content, success = yaml_to_html(yaml_text)
+            tab = self.document_tab
+            _, success, _, _, published, _ = render_document(tab.editor.toPlainText(), publish=True)
             
             if not success:
                 QMessageBox.warning(self, "Preview Error", 
                                   "Cannot open invalid YAML in browser. Please fix the errors first.")
                 return
             
-            temp_html = os.path.join(os.getcwd(), 'temp_preview.html')
-            with open(temp_html, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # Pages are served from memory by a local server; the browser
+            # reloads itself whenever this tab's preview is re-rendered.
+            if self.preview_server is None:
+                from webserver import PreviewServer
+                self.preview_server = PreviewServer()
+                self.preview_server.start()
+            if tab.server_key is None:
+                tab.server_key = uuid.uuid4().hex[:12]
+            self.preview_server.publish(tab.server_key, *published)
             
             import webbrowser
-            webbrowser.open('file://' + os.path.abspath(temp_html))
+            webbrowser.open(self.preview_server.url_for(tab.server_key))
             
-            self.statusBar().showMessage("Opened preview in browser", 3000)
+            self.statusBar().showMessage(f"Live preview at {self.preview_server.url_for(tab.server_key)}", 5000)
         except Exception as e:
             QMessageBox.critical(self, "Error",
                 f"Failed to open in browser: {str(e)}")
             self.statusBar().showMessage(f"Error opening in browser: {str(e)}", 5000)
 
 def main():
+    run_command(sys.argv)
+    if "--profile-startup" in sys.argv:
+        sys.argv.remove("--profile-startup")
+        startup_profile.enabled = True
+    startup_profile.mark("module imports")
+    # QtWebEngine is imported after the application exists, which Qt only
+    # allows when OpenGL contexts are shared from the start.
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
+    startup_profile.mark("QApplication")
     window = YAMLPreviewApp()
     window.show()
+    startup_profile.mark("window shown")
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
@@ -0,0 +1,273 @@
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from render_profile import RenderProfile
+
+class RenderHook:
+    """Callbacks on the conversion path; override the ones you need.
+
+    Hooks are called on the thread doing the conversion, possibly several
+    threads at once, so implementations must be thread-safe. The document
+    argument is a number that is unique per conversion within a process.
+    Component times are exclusive of the component's children. A component
+    is built (normalized from the parsed YAML) before it is rendered, and
+    both steps report their time; only rendering counts a component.
+    """
+
+    def document_started(self, document: int, source_bytes: int) -> None:
+        pass
+
+    def document_finished(self, document: int, seconds: float, success: bool, output_bytes: int) -> None:
+        pass
+
+    def component_built(self, document: int, component_type: str, seconds: float) -> None:
+        pass
+
+    def component_rendered(self, document: int, component_type: str, seconds: float) -> None:
+        pass
+
+    def asset_resolved(self, document: int, src: str, url: str, seconds: float) -> None:
+        pass
+
+# Replaced rather than mutated, so a conversion iterates over a stable tuple
+_hooks: Tuple[RenderHook, ...] = ()
+_hooks_lock = threading.Lock()
+_documents = itertools.count(1)
+
+def register(hook: RenderHook) -> None:
+    global _hooks
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks = _hooks + (hook,)
+
+def unregister(hook: RenderHook) -> None:
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(registered for registered in _hooks if registered is not hook)
+
+class HookedProfile(RenderProfile):
+    """Profile that reports each conversion to the registered hooks.
+
+    It stands in for the caller's own profile (if any) on the rendering path
+    and forwards everything to it as well.
+    """
+
+    def __init__(self, hooks: Sequence[RenderHook], source_bytes: int,
+                 profile: Optional[RenderProfile] = None):
+        super().__init__()
+        self.hooks = hooks
+        self.profile = profile
+        self.document = next(_documents)
+        for hook in hooks:
+            hook.document_started(self.document, source_bytes)
+
+    def add_phase(self, name: str, start: float, end: float) -> None:
+        super().add_phase(name, start, end)
+        if self.profile is not None:
+            self.profile.add_phase(name, start, end)
+
+    def component_started(self) -> float:
+        if self.profile is not None:
+            self.profile.component_started()
+        return super().component_started()
+
+    def component_built(self, component_type: str, started: float) -> float:
+        seconds = super().component_built(component_type, started)
+        if self.profile is not None:
+            self.profile.component_built(component_type, started)
+        for hook in self.hooks:
+            hook.component_built(self.document, component_type, seconds)
+        return seconds
+
+    def component_finished(self, component_type: str, started: float) -> float:
+        seconds = super().component_finished(component_type, started)
+        if self.profile is not None:
+            self.profile.component_finished(component_type, started)
+        for hook in self.hooks:
+            hook.component_rendered(self.document, component_type, seconds)
+        return seconds
+
+    def asset_resolved(self, src: str, url: str, seconds: float) -> None:
+        if self.profile is not None:
+            self.profile.asset_resolved(src, url, seconds)
+        for hook in self.hooks:
+            hook.asset_resolved(self.document, src, url, seconds)
+
+    def finish(self, success: bool, output: str) -> None:
+        seconds = time.perf_counter() - self.origin
+        output_bytes = len(output.encode("utf-8"))
+        for hook in self.hooks:
+            hook.document_finished(self.document, seconds, success, output_bytes)
+
+def start_document(source: str, profile: Optional[RenderProfile] = None) -> Optional[HookedProfile]:
+    """Begin reporting a conversion, or return None when no hooks are registered."""
+    hooks = _hooks
+    if not hooks:
+        return None
+    return HookedProfile(hooks, len(source.encode("utf-8")), profile)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class PrometheusExporter(RenderHook):
+    """Aggregate conversions into Prometheus text exposition format.
+
+    Serve render() from a metrics endpoint, or have a batch job call
+    write_textfile() for node_exporter's textfile collector.
+    """
+
+    def __init__(self, prefix: str = "webforge_render"):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.documents = {True: 0, False: 0}
+        self.bucket_counts = [0] * len(DURATION_BUCKETS)
+        self.duration_sum = 0.0
+        self.output_bytes = 0
+        self.component_counts: Dict[str, int] = {}
+        self.component_seconds: Dict[str, float] = {}
+        self.assets = 0
+        self.asset_seconds = 0.0
+
+    def document_finished(self, document: int, seconds: float, success: bool, output_bytes: int) -> None:
+        with self.lock:
+            self.documents[success] += 1
+            self.duration_sum += seconds
+            self.output_bytes += output_bytes
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    self.bucket_counts[index] += 1
+
+    def component_built(self, document: int, component_type: str, seconds: float) -> None:
+        with self.lock:
+            self.component_seconds[component_type] = self.component_seconds.get(component_type, 0.0) + seconds
+
+    def component_rendered(self, document: int, component_type: str, seconds: float) -> None:
+        with self.lock:
+            self.component_counts[component_type] = self.component_counts.get(component_type, 0) + 1
+            self.component_seconds[component_type] = self.component_seconds.get(component_type, 0.0) + seconds
+
+    def asset_resolved(self, document: int, src: str, url: str, seconds: float) -> None:
+        with self.lock:
+            self.assets += 1
+            self.asset_seconds += seconds
+
+    def render(self) -> str:
+        p = self.prefix
+        with self.lock:
+            total = self.documents[True] + self.documents[False]
+            lines = [
+                f"# HELP {p}_documents_total Documents converted, by result.",
+                f"# TYPE {p}_documents_total counter",
+                f'{p}_documents_total{{result="ok"}} {self.documents[True]}',
+                f'{p}_documents_total{{result="error"}} {self.documents[False]}',
+                f"# HELP {p}_duration_seconds Time to convert one document.",
+                f"# TYPE {p}_duration_seconds histogram",
+            ]
+            lines.extend(f'{p}_duration_seconds_bucket{{le="{bound}"}} {count}'
+                         for bound, count in zip(DURATION_BUCKETS, self.bucket_counts))
+            lines += [
+                f'{p}_duration_seconds_bucket{{le="+Inf"}} {total}',
+                f"{p}_duration_seconds_sum {self.duration_sum!r}",
+                f"{p}_duration_seconds_count {total}",
+                f"# HELP {p}_output_bytes_total HTML bytes produced.",
+                f"# TYPE {p}_output_bytes_total counter",
+                f"{p}_output_bytes_total {self.output_bytes}",
+                f"# HELP {p}_components_total Components rendered, by type.",
+                f"# TYPE {p}_components_total counter",
+            ]
+            lines.extend(f'{p}_components_total{{type="{_label(component_type)}"}} {count}'
+                         for component_type, count in sorted(self.component_counts.items()))
+            lines += [
+                f"# HELP {p}_component_seconds_total Time spent building and rendering components, by type.",
+                f"# TYPE {p}_component_seconds_total counter",
+            ]
+            lines.extend(f'{p}_component_seconds_total{{type="{_label(component_type)}"}} {seconds!r}'
+                         for component_type, seconds in sorted(self.component_seconds.items()))
+            lines += [
+                f"# HELP {p}_assets_total Local asset paths resolved to file URLs.",
+                f"# TYPE {p}_assets_total counter",
+                f"{p}_assets_total {self.assets}",
+                f"# HELP {p}_asset_seconds_total Time spent resolving local assets.",
+                f"# TYPE {p}_asset_seconds_total counter",
+                f"{p}_asset_seconds_total {self.asset_seconds!r}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        # The collector may read at any moment, so never expose a partial file
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix=".webforge-", suffix=".prom", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(self.render())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+class JSONLinesExporter(RenderHook):
+    """Append one JSON object per converted document to a file.
+
+    Each line is written with a single O_APPEND write, so several processes
+    (such as render service workers) can share one log file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.lock = threading.Lock()
+        self.open_documents: Dict[int, dict] = {}
+
+    def document_started(self, document: int, source_bytes: int) -> None:
+        with self.lock:
+            self.open_documents[document] = {"source_bytes": source_bytes, "components": {},
+                                             "assets": 0, "asset_seconds": 0.0}
+
+    def component_built(self, document: int, component_type: str, seconds: float) -> None:
+        with self.lock:
+            components = self.open_documents[document]["components"]
+            components.setdefault(component_type, [0, 0.0])[1] += seconds
+
+    def component_rendered(self, document: int, component_type: str, seconds: float) -> None:
+        with self.lock:
+            components = self.open_documents[document]["components"]
+            entry: List = components.setdefault(component_type, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def asset_resolved(self, document: int, src: str, url: str, seconds: float) -> None:
+        with self.lock:
+            record = self.open_documents[document]
+            record["assets"] += 1
+            record["asset_seconds"] += seconds
+
+    def document_finished(self, document: int, seconds: float, success: bool, output_bytes: int) -> None:
+        with self.lock:
+            record = self.open_documents.pop(document)
+        line = json.dumps({
+            "time": time.time(),
+            "pid": os.getpid(),
+            "document": document,
+            "success": success,
+            "seconds": seconds,
+            "source_bytes": record["source_bytes"],
+            "output_bytes": output_bytes,
+            "components": {component_type: {"count": count, "seconds": total}
+                           for component_type, (count, total) in record["components"].items()},
+            "assets": record["assets"],
+            "asset_seconds": record["asset_seconds"],
+        })
+        os.write(self.fd, (line + "\n").encode("utf-8"))
+
+    def close(self) -> None:
+        os.close(self.fd)
@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+class RenderProfile:
+    """Phase timings and per-component-type cost of one preview refresh.
+
+    Phases may be recorded from several threads (the render worker parses
+    and renders, the GUI thread writes and loads the page). Component times
+    are exclusive: a section's time does not include its children's. They
+    cover both building a component's node and emitting its markup.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases: List[Tuple[str, float, float, int]] = []
+        self.threads: Dict[int, str] = {}
+        self.component_counts: Dict[str, int] = {}
+        self.component_seconds: Dict[str, float] = {}
+        self._child_seconds: List[float] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start, time.perf_counter())
+
+    def add_phase(self, name: str, start: float, end: float) -> None:
+        thread = threading.current_thread()
+        self.threads[thread.ident] = thread.name
+        self.phases.append((name, start, end, thread.ident))
+
+    def component_started(self) -> float:
+        self._child_seconds.append(0.0)
+        return time.perf_counter()
+
+    def _exclusive_seconds(self, started: float) -> float:
+        elapsed = time.perf_counter() - started
+        children = self._child_seconds.pop()
+        if self._child_seconds:
+            self._child_seconds[-1] += elapsed
+        return elapsed - children
+
+    def component_built(self, component_type: str, started: float) -> float:
+        """Add the time to build a component's node; return it in seconds."""
+        seconds = self._exclusive_seconds(started)
+        self.component_seconds[component_type] = self.component_seconds.get(component_type, 0.0) + seconds
+        return seconds
+
+    def component_finished(self, component_type: str, started: float) -> float:
+        """Record a rendered component and return its exclusive time in seconds."""
+        seconds = self._exclusive_seconds(started)
+        self.component_counts[component_type] = self.component_counts.get(component_type, 0) + 1
+        self.component_seconds[component_type] = self.component_seconds.get(component_type, 0.0) + seconds
+        return seconds
+
+    def asset_resolved(self, src: str, url: str, seconds: float) -> None:
+        pass
+
+    def phase_totals(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for name, start, end, _ in self.phases:
+            totals[name] = totals.get(name, 0.0) + end - start
+        return totals
+
+    def summary(self, top: int = 3) -> str:
+        """One line for the status bar, e.g. "parse 2.1 · render 0.8 ms | image 80% (12)"."""
+        text = " · ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in self.phase_totals().items())
+        text = f"{text} ms" if text else "no phases"
+        total = sum(self.component_seconds.values())
+        if total > 0:
+            ranked = sorted(self.component_seconds.items(), key=lambda item: item[1], reverse=True)
+            text += " | " + ", ".join(
+                f"{component_type} {seconds / total:.0%} ({self.component_counts.get(component_type, 0)})"
+                for component_type, seconds in ranked[:top])
+        return text
+
+    def trace_events(self) -> List[dict]:
+        """Chrome trace events: one complete event per phase.
+
+        A "preview" event on the GUI thread spans the whole refresh and
+        carries the per-component-type counts and times in its args.
+        """
+        pid = os.getpid()
+        events = [{"name": name, "cat": "render", "ph": "X", "pid": pid, "tid": tid,
+                   "ts": start * 1e6, "dur": (end - start) * 1e6}
+                  for name, start, end, tid in self.phases]
+        if self.phases:
+            end = max(phase[2] for phase in self.phases)
+            components = {component_type: {"count": self.component_counts.get(component_type, 0),
+                                            "ms": round(seconds * 1000, 3)}
+                          for component_type, seconds in self.component_seconds.items()}
+            events.insert(0, {"name": "preview", "cat": "render", "ph": "X", "pid": pid,
+                              "tid": threading.main_thread().ident, "ts": self.origin * 1e6,
+                              "dur": (end - self.origin) * 1e6, "args": {"components": components}})
+        return events
+
+def phase(profile: Optional[RenderProfile], name: str):
+    """Time a block as a phase of profile, or do nothing when profile is None."""
+    return profile.phase(name) if profile is not None else nullcontext()
+
+def write_chrome_trace(profiles: Iterable[RenderProfile], path: str) -> None:
+    """Write profiles as a trace file for chrome://tracing or Perfetto."""
+    events: List[dict] = []
+    threads: Dict[int, str] = {threading.main_thread().ident: threading.main_thread().name}
+    for profile in profiles:
+        events.extend(profile.trace_events())
+        threads.update(profile.threads)
+    pid = os.getpid()
+    events.extend({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in threads.items())
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, List, Optional
+
+from webserver import HTTPError, read_request, response_bytes
+
+LATENCY_WINDOW = 1024
+
+def _convert(yaml_text: str):
+    from yaml_converter import yaml_to_html
+    return yaml_to_html(yaml_text)
+
+def _warm_up(metrics_log: Optional[str] = None) -> None:
+    import yaml_converter  # noqa: F401
+    if metrics_log:
+        import render_hooks
+        render_hooks.register(render_hooks.JSONLinesExporter(metrics_log))
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of samples, or None when there are none."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+class RenderService:
+    """HTTP front end that converts posted YAML to HTML in a process pool.
+
+    POST /render takes the YAML document as the request body and answers
+    with the page (422 with the error page when the YAML is invalid).
+    At most workers + queue_size conversions are admitted at a time; any
+    request beyond that gets 429 straight away instead of waiting, so a
+    saturated service sheds load rather than building an unbounded backlog.
+    GET /health and GET /metrics report queue depth and recent latencies.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: Optional[int] = None,
+                 queue_size: int = 64, max_body: int = 8 * 1024 * 1024,
+                 metrics_log: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_body = max_body
+        self.metrics_log = metrics_log
+        self.in_flight = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.counters: Dict[str, int] = {"requests": 0, "rendered": 0, "invalid": 0,
+                                         "rejected": 0, "errors": 0}
+        self.started = time.time()
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    async def serve(self) -> None:
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up,
+                                        initargs=(self.metrics_log,))
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        port = server.sockets[0].getsockname()[1]
+        print(f"WebForge render service on http://{self.host}:{port} "
+              f"({self.workers} workers, queue {self.queue_size})", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, _, body = await read_request(reader, self.max_body)
+            except HTTPError as e:
+                writer.write(response_bytes(e.status, str(e).encode()))
+                return
+            path = path.split("?", 1)[0].rstrip("/") or "/"
+            if path == "/render":
+                if method != "POST":
+                    writer.write(response_bytes(405, b"Method Not Allowed", headers={"Allow": "POST"}))
+                else:
+                    writer.write(await self.render(body))
+            elif path in ("/health", "/metrics"):
+                if method not in ("GET", "HEAD"):
+                    writer.write(response_bytes(405, b"Method Not Allowed", headers={"Allow": "GET, HEAD"}))
+                else:
+                    report = self.health() if path == "/health" else self.metrics()
+                    writer.write(response_bytes(200, json.dumps(report).encode(), "application/json",
+                                                head_only=method == "HEAD"))
+            else:
+                writer.write(response_bytes(404, b"Not Found"))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+            except ConnectionError:
+                pass
+
+    async def render(self, body: bytes) -> bytes:
+        self.counters["requests"] += 1
+        if self.in_flight >= self.capacity:
+            self.counters["rejected"] += 1
+            return response_bytes(429, b"Render queue is full", headers={"Retry-After": "1"})
+        try:
+            yaml_text = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return response_bytes(400, b"Request body must be UTF-8 YAML")
+
+        start = time.perf_counter()
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            html, success = await loop.run_in_executor(self.pool, _convert, yaml_text)
+        except Exception as e:
+            self.counters["errors"] += 1
+            return response_bytes(500, str(e).encode("utf-8"))
+        finally:
+            self.in_flight -= 1
+        self.latencies.append(time.perf_counter() - start)
+        self.counters["rendered" if success else "invalid"] += 1
+        return response_bytes(200 if success else 422, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def health(self) -> dict:
+        return {
+            "status": "saturated" if self.in_flight >= self.capacity else "ok",
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "queue_capacity": self.queue_size,
+        }
+
+    def metrics(self) -> dict:
+        samples = list(self.latencies)
+        p50 = percentile(samples, 0.50)
+        p99 = percentile(samples, 0.99)
+        return dict(self.health(), **self.counters, **{
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "latency_samples": len(samples),
+            "latency_p50_ms": round(p50 * 1000, 3) if p50 is not None else None,
+            "latency_p99_ms": round(p99 * 1000, 3) if p99 is not None else None,
+        })
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="webforge serve",
+                                     description="Run the YAML to HTML render service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="render processes (default: one per CPU)")
+    parser.add_argument("--queue-size", type=int, default=64,
+                        help="requests allowed to wait for a worker before 429 is returned")
+    parser.add_argument("--max-body", type=int, default=8 * 1024 * 1024,
+                        help="largest accepted request body in bytes")
+    parser.add_argument("--metrics-log", metavar="PATH",
+                        help="append one JSON line of render metrics per document to PATH")
+    args = parser.parse_args(argv)
+    service = RenderService(args.host, args.port, args.workers, args.queue_size, args.max_body,
+                            args.metrics_log)
+    try:
+        asyncio.run(service.serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
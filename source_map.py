@@ -0,0 +1,73 @@
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+class SourceMap:
+    """Two-way map between editor lines and rendered components.
+
+    Components are numbered in document order, which is the order
+    build_outline lists them and the order render_page gives them their
+    data-wf-id attributes, so the ids need no table of their own in the page.
+
+    Component line ranges nest, so they are flattened once into disjoint
+    segments, each owned by the innermost component covering it; finding
+    the component on a line is then a single binary search.
+    """
+
+    def __init__(self, outline: List[Dict[str, Any]]):
+        self.positions: List[Tuple[int, int, int]] = []
+        self.segment_starts: List[int] = []
+        self.segment_owners: List[Optional[int]] = []
+        self._add_segments(outline, None, None)
+
+    def _add_segment(self, line: int, owner: Optional[int]) -> None:
+        # A segment that starts where the previous one does replaces it
+        if self.segment_starts and self.segment_starts[-1] == line:
+            self.segment_owners[-1] = owner
+        else:
+            self.segment_starts.append(line)
+            self.segment_owners.append(owner)
+
+    def _add_segments(self, entries: List[Dict[str, Any]], parent: Optional[int],
+                      limit: Optional[int]) -> None:
+        for index, entry in enumerate(entries):
+            component_id = len(self.positions)
+            start = entry["line"]
+            # A mapping ends where the next token starts, which may be on the
+            # next sibling's first line, so ranges are cut off there.
+            end = entry["end_line"]
+            if index + 1 < len(entries):
+                end = min(end, entries[index + 1]["line"])
+            if limit is not None:
+                end = min(end, limit)
+            self.positions.append((start, entry["column"], max(end, start + 1)))
+            if end <= start:
+                # Shares its only line with a later flow-style sibling, which owns it
+                self._add_children(entry["children"])
+                continue
+            self._add_segment(start, component_id)
+            self._add_segments(entry["children"], component_id, end)
+            self._add_segment(end, parent)
+
+    def _add_children(self, entries: List[Dict[str, Any]]) -> None:
+        # Numbers components that own no lines, keeping later ids in step
+        for entry in entries:
+            self.positions.append((entry["line"], entry["column"], entry["line"] + 1))
+            self._add_children(entry["children"])
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def component_at(self, line: int) -> Optional[int]:
+        """Return the id of the innermost component on a zero-based line, if any."""
+        index = bisect_right(self.segment_starts, line) - 1
+        return self.segment_owners[index] if index >= 0 else None
+
+    def position_of(self, component_id: int) -> Tuple[int, int]:
+        """Return the zero-based line and column where a component starts."""
+        line, column, _ = self.positions[component_id]
+        return line, column
+
+    def line_range(self, component_id: int) -> Tuple[int, int]:
+        """Return the component's first line and the line after its last."""
+        line, _, end = self.positions[component_id]
+        return line, end
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import mimetypes
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote
+
+MAX_HEADER_BYTES = 64 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    202: "Accepted",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+LIVE_RELOAD_SCRIPT = """<script>
+(function () {
+    var source = new EventSource("/events/%s");
+    source.addEventListener("reload", function () {
+        sessionStorage.setItem("webforge-scroll", String(window.scrollY));
+        location.reload();
+    });
+    window.addEventListener("load", function () {
+        var scroll = sessionStorage.getItem("webforge-scroll");
+        if (scroll !== null) {
+            sessionStorage.removeItem("webforge-scroll");
+            window.scrollTo(0, parseFloat(scroll));
+        }
+    });
+})();
+</script>
+"""
+
+class HTTPError(Exception):
+    def __init__(self, status: int):
+        super().__init__(STATUS_TEXT.get(status, str(status)))
+        self.status = status
+
+async def read_request(reader: asyncio.StreamReader,
+                       max_body: int = 0) -> Tuple[str, str, Dict[str, str], bytes]:
+    """Read one HTTP/1.1 request and return (method, path, headers, body).
+
+    Header names are lower-cased. Bodies larger than max_body are rejected
+    with 413 before they are read; only Content-Length bodies are supported.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(400)
+    if len(head) > MAX_HEADER_BYTES:
+        raise HTTPError(400)
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, path, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    body = b""
+    length = headers.get("content-length")
+    if length:
+        if not length.isdigit():
+            raise HTTPError(400)
+        if int(length) > max_body:
+            raise HTTPError(413)
+        body = await reader.readexactly(int(length))
+    return method.upper(), path, headers, body
+
+def response_bytes(status: int, body: bytes = b"", content_type: str = "text/plain; charset=utf-8",
+                   headers: Optional[Dict[str, str]] = None, head_only: bool = False) -> bytes:
+    """Serialize a complete response with Content-Length and Connection: close."""
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+    all_headers = {"Content-Type": content_type, "Content-Length": str(len(body)),
+                   "Connection": "close"}
+    all_headers.update(headers or {})
+    lines.extend(f"{name}: {value}" for name, value in all_headers.items())
+    data = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return data if head_only or status == 304 else data + body
+
+def file_url_to_path(url: str) -> str:
+    path = unquote(url[len("file://"):]).lstrip("/")
+    if re.match(r"[A-Za-z]:", path):
+        return path
+    return "/" + path
+
+class PreviewServer:
+    """Serve rendered pages from memory with ETags and live reload.
+
+    The server runs an asyncio loop on a daemon thread and only listens on
+    the loopback interface. publish() may be called from any thread; every
+    browser showing that page is told to reload over server-sent events.
+    The local images a page is published with are exposed under /assets/
+    for as long as it refers to them, and nothing else on disk is reachable.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.pages: Dict[str, Tuple[bytes, str]] = {}
+        self.assets: Dict[str, Dict[str, str]] = {}
+        self.listeners: Dict[str, set] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server = None
+        self.ready = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.run, name="webforge-preview-server", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+
+    def run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, self.host, self.port))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        self.loop.run_forever()
+
+    def stop(self) -> None:
+        if self.loop is None:
+            return
+        def shutdown():
+            self.server.close()
+            for queues in self.listeners.values():
+                for queue in queues:
+                    queue.put_nowait(None)
+            self.loop.call_later(0.1, self.loop.stop)
+        self.loop.call_soon_threadsafe(shutdown)
+        self.thread.join(2)
+
+    def url_for(self, key: str) -> str:
+        return f"http://{self.host}:{self.port}/preview/{key}"
+
+    def publish(self, key: str, html: str, asset_urls: Iterable[str] = ()) -> None:
+        """Replace the page served under key and notify its open browsers.
+
+        asset_urls are the file:// URLs of the page's local images (see
+        PageTree.assets); only src attributes naming them are rewritten.
+        """
+        assets = {}
+        for url in dict.fromkeys(asset_urls):
+            path = file_url_to_path(url)
+            token = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+            assets[token] = path
+            html = html.replace(f'src="{url}"', f'src="/assets/{key}/{token}/{os.path.basename(url)}"')
+        script = LIVE_RELOAD_SCRIPT % key
+        position = html.rfind("</body>")
+        html = html[:position] + script + html[position:] if position >= 0 else html + script
+        body = html.encode("utf-8")
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        self.loop.call_soon_threadsafe(self.update_page, key, body, etag, assets)
+
+    def update_page(self, key: str, body: bytes, etag: str, assets: Dict[str, str]) -> None:
+        previous = self.pages.get(key)
+        self.pages[key] = (body, etag)
+        self.assets[key] = assets
+        if previous is not None and previous[1] != etag:
+            for queue in self.listeners.get(key, ()):
+                queue.put_nowait(etag)
+
+    def unpublish(self, key: str) -> None:
+        def remove():
+            self.pages.pop(key, None)
+            self.assets.pop(key, None)
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(remove)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, headers, _ = await read_request(reader)
+            except HTTPError as e:
+                writer.write(response_bytes(e.status, str(e).encode()))
+                return
+            if method not in ("GET", "HEAD"):
+                writer.write(response_bytes(405, b"Method Not Allowed", headers={"Allow": "GET, HEAD"}))
+                return
+            parts = path.split("?", 1)[0].strip("/").split("/")
+            if parts[0] == "events" and len(parts) == 2:
+                await self.stream_events(parts[1], writer)
+                return
+            writer.write(self.respond(parts, headers, method == "HEAD"))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+            except ConnectionError:
+                pass
+
+    def respond(self, parts, headers: Dict[str, str], head_only: bool) -> bytes:
+        if parts[0] == "preview" and len(parts) == 2 and parts[1] in self.pages:
+            body, etag = self.pages[parts[1]]
+            cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if headers.get("if-none-match") == etag:
+                return response_bytes(304, headers=cache_headers)
+            return response_bytes(200, body, "text/html; charset=utf-8", cache_headers, head_only)
+        if parts[0] == "assets" and len(parts) >= 3:
+            path = self.assets.get(parts[1], {}).get(parts[2])
+            if path is not None and os.path.isfile(path):
+                with open(path, "rb") as file:
+                    body = file.read()
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+                if headers.get("if-none-match") == etag:
+                    return response_bytes(304, headers=cache_headers)
+                content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                return response_bytes(200, body, content_type, cache_headers, head_only)
+        return response_bytes(404, b"Not Found")
+
+    async def stream_events(self, key: str, writer: asyncio.StreamWriter) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        self.listeners.setdefault(key, set()).add(queue)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n"
+                         b"retry: 1000\n\n")
+            await writer.drain()
+            while True:
+                try:
+                    etag = await asyncio.wait_for(queue.get(), 15)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                else:
+                    if etag is None:
+                        return
+                    writer.write(f"event: reload\ndata: {etag}\n\n".encode("utf-8"))
+                await writer.drain()
+        finally:
+            self.listeners[key].discard(queue)
@@ -1,9 +1,14 @@
+import itertools
 import yaml
 import os
-from typing import Dict, Any, Tuple
-from urllib.parse import urlparse
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlparse
 from pathlib import Path
 
+import render_hooks
+from render_profile import RenderProfile, phase
+
 def get_button_variant_styles(variant: str, size: str, button_style: str) -> Dict[str, str]:
     base_styles = {
         "border": "none",
@@ -215,8 +220,9 @@ def path_to_file_url(path: str) -> str:
             path = path[0] + ':' + path[2:]
             print(f"Fixed drive letter: {path}")
         
+        # Percent-encoded, so that paths with spaces survive as one URL
         if not path.startswith('file://'):
-            path = 'file:///' + path
+            path = 'file:///' + quote(path, safe='/:')
             print(f"Added file:// prefix: {path}")
             
         print(f"Final file URL: {path}")
@@ -232,101 +238,392 @@ def style_dict_to_html(style_dict: Dict[str, str]) -> str:
     styles = [f"{k}: {v}" for k, v in style_dict.items()]
     return f' style="{"; ".join(styles)}"'
 
-def render_component(component: Dict[str, Any]) -> str:
-    if not isinstance(component, dict):
-        return ""
-        
-    component_type = component.get("type", "").lower()
-    style = style_dict_to_html(component.get("style", {}))
-    text = component.get("text", "")
-    if component_type == "header":
-        return f"<h1{style}>{text}</h1>"
-        
-    elif component_type == "paragraph":
-        return f"<p{style}>{text}</p>"
-        
-    elif component_type == "image":
+CONTAINER_TYPES = ("section", "div")
+COMPONENT_TYPES = ("header", "paragraph", "image", "list", "button") + CONTAINER_TYPES
+TYPE_IDS = {component_type: type_id for type_id, component_type in enumerate(COMPONENT_TYPES)}
+
+INDENT = "  "
+ORDERED_LIST_TYPES = ("decimal", "decimal-leading-zero", "lower-roman", "upper-roman", "lower-alpha", "upper-alpha")
+LIST_TYPES = ("none", "disc", "circle", "square") + ORDERED_LIST_TYPES
+BUTTON_VARIANTS = ("primary", "secondary", "success", "danger", "warning", "info", "light", "dark")
+BUTTON_SIZES = ("small", "medium", "large")
+BUTTON_STYLES = ("solid", "outline", "ghost")
+IMAGE_FALLBACK = 'onerror="this.onerror=null; this.src=\'data:image/svg+xml;charset=UTF-8,%3Csvg%20width%3D%22800%22%20height%3D%22600%22%20xmlns%3D%22http%3A%2F%2Fwww.w3.org%2F2000%2Fsvg%22%3E%3Crect%20width%3D%22800%22%20height%3D%22600%22%20fill%3D%22%23f0f0f0%22%2F%3E%3Ctext%20x%3D%2250%25%22%20y%3D%2250%25%22%20font-family%3D%22Arial%22%20font-size%3D%2230%22%20fill%3D%22%23999%22%20text-anchor%3D%22middle%22%20dominant-baseline%3D%22middle%22%3EImage%20not%20found%3C%2Ftext%3E%3C%2Fsvg%3E\';"'
+
+class Component:
+    """A node of the normalized component tree.
+
+    Built once from the parsed YAML by build_component: the type is fixed by
+    the node's class (type_id indexes COMPONENT_TYPES), styles are stored as
+    serialized attribute strings, and each class keeps only the fields its
+    markup needs, in __slots__.
+    """
+    __slots__ = ("style", "text")
+    type_id = -1
+
+    def __init__(self, style: str, text: Any):
+        self.style = style
+        self.text = text
+
+    @property
+    def type_name(self) -> str:
+        return COMPONENT_TYPES[self.type_id]
+
+    @classmethod
+    def build(cls, component: Dict[str, Any], style: str, text: Any, strings: Dict[str, str],
+              profile: Optional[RenderProfile]) -> Optional["Component"]:
+        return cls(style, text)
+
+    def emit(self, pad: str, depth: Optional[int], out: List[str], starts: Optional[List[int]],
+             profile: Optional[RenderProfile], ids: Optional[Iterator[int]]) -> None:
+        raise NotImplementedError
+
+class Header(Component):
+    __slots__ = ()
+    type_id = TYPE_IDS["header"]
+
+    def emit(self, pad, depth, out, starts, profile, ids):
+        out.append(f"{pad}<h1{self.style}{_id_attribute(ids)}>{self.text}</h1>")
+
+class Paragraph(Component):
+    __slots__ = ()
+    type_id = TYPE_IDS["paragraph"]
+
+    def emit(self, pad, depth, out, starts, profile, ids):
+        out.append(f"{pad}<p{self.style}{_id_attribute(ids)}>{self.text}</p>")
+
+class Image(Component):
+    __slots__ = ("src", "alt")
+    type_id = TYPE_IDS["image"]
+
+    @classmethod
+    def build(cls, component, style, text, strings, profile):
+        node = cls(style, text)
         src = component.get("src", "")
-        alt = component.get("alt", "")
         if is_local_path(src):
-            src = path_to_file_url(src)
-        return f'<img src="{src}" alt="{alt}"{style} onerror="this.onerror=null; this.src=\'data:image/svg+xml;charset=UTF-8,%3Csvg%20width%3D%22800%22%20height%3D%22600%22%20xmlns%3D%22http%3A%2F%2Fwww.w3.org%2F2000%2Fsvg%22%3E%3Crect%20width%3D%22800%22%20height%3D%22600%22%20fill%3D%22%23f0f0f0%22%2F%3E%3Ctext%20x%3D%2250%25%22%20y%3D%2250%25%22%20font-family%3D%22Arial%22%20font-size%3D%2230%22%20fill%3D%22%23999%22%20text-anchor%3D%22middle%22%20dominant-baseline%3D%22middle%22%3EImage%20not%20found%3C%2Ftext%3E%3C%2Fsvg%3E\';">'
-        
-    elif component_type == "list":
+            if profile is not None:
+                resolve_start = time.perf_counter()
+                url = path_to_file_url(src)
+                profile.asset_resolved(src, url, time.perf_counter() - resolve_start)
+                src = url
+            else:
+                src = path_to_file_url(src)
+        node.src = src
+        node.alt = component.get("alt", "")
+        return node
+
+    def emit(self, pad, depth, out, starts, profile, ids):
+        out.append(f'{pad}<img src="{self.src}" alt="{self.alt}"{self.style}{_id_attribute(ids)} {IMAGE_FALLBACK}>')
+
+class ListComponent(Component):
+    __slots__ = ("tag", "list_style", "items")
+    type_id = TYPE_IDS["list"]
+
+    @classmethod
+    def build(cls, component, style, text, strings, profile):
         items = component.get("items", [])
-        if not items:
-            return ""
-            
+        # Must agree with _has_items, or the outline and the page disagree
+        if not isinstance(items, (list, tuple)) or not items:
+            return None
+        node = cls(style, text)
         list_type = component.get("list-type", "none").lower()
-        
         list_style = component.get("style", {}).copy()
         list_style["list-style-type"] = list_type
-        
-        list_style_str = style_dict_to_html(list_style)
-        
-        list_tag = "ol" if list_type in ["decimal", "decimal-leading-zero", "lower-roman", "upper-roman", "lower-alpha", "upper-alpha"] else "ul"
-        
-        list_html = [f'<{list_tag}{list_style_str}>']
+        node.list_style = _shared(strings, style_dict_to_html(list_style))
+        node.tag = "ol" if list_type in ORDERED_LIST_TYPES else "ul"
+        # Items are kept as their finished <li> markup, less the indent
+        entries = []
         for item in items:
             if isinstance(item, dict):
                 for key, value in item.items():
-                    list_html.append(f"<li><strong>{key}:</strong> {value}</li>")
+                    entries.append(f"<li><strong>{key}:</strong> {value}</li>")
             else:
-                list_html.append(f"<li>{item}</li>")
-        list_html.append(f"</{list_tag}>")
-        return f'<div{style}>{"".join(list_html)}</div>'
-        
-    elif component_type == "button":
-        link = component.get("link", "#")
-        variant = component.get("variant", "primary")
-        size = component.get("size", "medium")
-        button_style = component.get("button-style", "solid")
+                entries.append(f"<li>{item}</li>")
+        node.items = tuple(entries)
+        return node
+
+    def emit(self, pad, depth, out, starts, profile, ids):
+        inner_pad = pad + INDENT if depth is not None else ""
+        item_pad = inner_pad + INDENT if depth is not None else ""
+        out.append(f'{pad}<div{self.style}{_id_attribute(ids)}>')
+        out.append(f'{inner_pad}<{self.tag}{self.list_style}>')
+        out.extend(item_pad + item for item in self.items)
+        out.append(f"{inner_pad}</{self.tag}>")
+        out.append(f"{pad}</div>")
+
+class Button(Component):
+    __slots__ = ("link", "button_style")
+    type_id = TYPE_IDS["button"]
+
+    @classmethod
+    def build(cls, component, style, text, strings, profile):
+        node = cls(style, text)
+        node.link = component.get("link", "#")
+        variant_styles = get_button_variant_styles(component.get("variant", "primary"),
+                                                   component.get("size", "medium"),
+                                                   component.get("button-style", "solid"))
         custom_styles = component.get("style", {})
-        
-        variant_styles = get_button_variant_styles(variant, size, button_style)
-        
         if custom_styles:
             variant_styles.update(custom_styles)
-        
-        variant_style_str = style_dict_to_html(variant_styles)
-        
-        return f'<div class="buttons"><a href="{link}"><button{variant_style_str}>{text}</button></a></div>'
-        
-    elif component_type == "section":
-        children = component.get("children", [])
-        section_html = [f'<section{style}>']
-        
-        if text:
-            section_html.append(f'<div class="section-text">{text}</div>')
-            
-        if children:
-            for child in children:
-                section_html.append(render_component(child))
-                
-        section_html.append("</section>")
-        return "".join(section_html)
-        
-    elif component_type == "div":
+        node.button_style = _shared(strings, style_dict_to_html(variant_styles))
+        return node
+
+    def emit(self, pad, depth, out, starts, profile, ids):
+        inner_pad = pad + INDENT if depth is not None else ""
+        out.append(f'{pad}<div class="buttons"{_id_attribute(ids)}>')
+        out.append(f'{inner_pad}<a href="{self.link}">')
+        out.append(f'{inner_pad}{INDENT if depth is not None else ""}<button{self.button_style}>{self.text}</button>')
+        out.append(f'{inner_pad}</a>')
+        out.append(f'{pad}</div>')
+
+class Container(Component):
+    __slots__ = ("children",)
+    tag = "div"
+
+    @classmethod
+    def build(cls, component, style, text, strings, profile):
+        node = cls(style, text)
         children = component.get("children", [])
-        div_html = [f'<div{style}>']
-        
-        if text:
-            div_html.append(f'<div class="div-text">{text}</div>')
-            
-        if children:
-            for child in children:
-                div_html.append(render_component(child))
-                
-        div_html.append("</div>")
-        return "".join(div_html)
-        
-    return ""
+        node.children = _build_children(children, strings, profile) if children else ()
+        return node
+
+    def emit(self, pad, depth, out, starts, profile, ids):
+        inner_pad = pad + INDENT if depth is not None else ""
+        child_depth = depth + 1 if depth is not None else None
+        out.append(f'{pad}<{self.tag}{self.style}{_id_attribute(ids)}>')
+        if self.text:
+            out.append(f'{inner_pad}<div class="{self.type_name}-text">{self.text}</div>')
+        for child in self.children:
+            emit_component(child, child_depth, out, starts, profile, ids)
+        out.append(f"{pad}</{self.tag}>")
+
+class Section(Container):
+    __slots__ = ()
+    type_id = TYPE_IDS["section"]
+    tag = "section"
+
+class Div(Container):
+    __slots__ = ()
+    type_id = TYPE_IDS["div"]
+
+COMPONENT_CLASSES = {COMPONENT_TYPES[cls.type_id]: cls
+                     for cls in (Header, Paragraph, Image, ListComponent, Button, Section, Div)}
+
+class PageTree:
+    """The normalized form of a whole document.
+
+    assets lists the file:// URLs that the page's Image nodes resolved
+    their local paths to, in document order.
+    """
+    __slots__ = ("title", "body_style", "body_text", "children", "assets")
 
-def yaml_to_html(yaml_text: str) -> Tuple[str, bool]:
+    def __init__(self, title: Any, body_style: str, body_text: Any, children: Tuple[Component, ...]):
+        self.title = title
+        self.body_style = body_style
+        self.body_text = body_text
+        self.children = children
+        self.assets = _local_assets(children)
+
+def _local_assets(nodes: Tuple[Component, ...], found: Optional[List[str]] = None) -> List[str]:
+    if found is None:
+        found = []
+    for node in nodes:
+        if isinstance(node, Image):
+            if node.src.startswith("file://"):
+                found.append(node.src)
+        elif isinstance(node, Container):
+            _local_assets(node.children, found)
+    return found
+
+def _id_attribute(ids: Optional[Iterator[int]]) -> str:
+    return f' data-wf-id="{next(ids)}"' if ids is not None else ""
+
+def _shared(strings: Dict[str, str], value: str) -> str:
+    # Identical style strings are stored once per tree
+    return strings.setdefault(value, value)
+
+def _build_children(children: Any, strings: Dict[str, str],
+                    profile: Optional[RenderProfile]) -> Tuple[Component, ...]:
+    nodes = []
+    for child in children:
+        node = build_component(child, strings, profile)
+        if node is not None:
+            nodes.append(node)
+    return tuple(nodes)
+
+def build_component(component: Any, strings: Optional[Dict[str, str]] = None,
+                    profile: Optional[RenderProfile] = None) -> Optional[Component]:
+    """Normalize one parsed component, or return None if it renders nothing.
+
+    strings, if given, is shared across calls so that equal style strings
+    are stored once. Local image paths are resolved to file URLs here.
+    """
+    if not isinstance(component, dict):
+        return None
+    cls = COMPONENT_CLASSES.get(component.get("type", "").lower())
+    if cls is None:
+        return None
+    if strings is None:
+        strings = {}
+    if profile is None:
+        style = _shared(strings, style_dict_to_html(component.get("style", {})))
+        return cls.build(component, style, component.get("text", ""), strings, profile)
+    # Building is where image paths are resolved and button styles worked
+    # out, so it is timed as part of the component's type as well
+    started = profile.component_started()
+    style = _shared(strings, style_dict_to_html(component.get("style", {})))
+    node = cls.build(component, style, component.get("text", ""), strings, profile)
+    profile.component_built(COMPONENT_TYPES[cls.type_id], started)
+    return node
+
+def build_page_tree(data: Dict[str, Any], profile: Optional[RenderProfile] = None) -> PageTree:
+    """Normalize a parsed document into a PageTree.
+
+    The tree is built from the parsed dicts on every render and only lives
+    as long as the render; the outline, source map and validator still work
+    from the composed YAML nodes, and the preview caches finished pages.
+    """
+    strings: Dict[str, str] = {}
+    body = data.get("body", {})
+    children = body.get("children", []) if "body" in data else []
+    return PageTree(data.get("title", "Untitled Page"), style_dict_to_html(body.get("style", {})),
+                    body.get("text", ""), _build_children(children, strings, profile))
+
+def render_component(component: Any, depth: Optional[int] = None,
+                     profile: Optional[RenderProfile] = None,
+                     ids: Optional[Iterator[int]] = None) -> str:
+    """Render one component (a parsed dict or a Component node) to HTML.
+
+    With depth=None the markup is compact. With an integer depth every element
+    goes on its own line, indented to that depth, so pretty output is produced
+    in the same pass instead of by re-parsing compact HTML. When ids (such as
+    an itertools.count()) is given, each rendered component's outermost
+    element gets the next one as its data-wf-id attribute, in document order.
+    """
+    if not isinstance(component, Component):
+        component = build_component(component, profile=profile)
+        if component is None:
+            return ""
+    fragments: List[str] = []
+    emit_component(component, depth, fragments, profile=profile, ids=ids)
+    return ("\n" if depth is not None else "").join(fragments)
+
+def emit_component(component: Component, depth: Optional[int], out: List[str],
+                   starts: Optional[List[int]] = None, profile: Optional[RenderProfile] = None,
+                   ids: Optional[Iterator[int]] = None) -> None:
+    """Append the markup of a component node to out, one element tag per fragment.
+
+    When starts is given, the index in out of each rendered component's first
+    fragment is appended to it in document order. When profile is given, the
+    time spent on each component is added to its type's total.
+    """
+    if starts is not None:
+        starts.append(len(out))
+    if profile is not None:
+        started = profile.component_started()
+    component.emit(INDENT * depth if depth is not None else "", depth, out, starts, profile, ids)
+    if profile is not None:
+        profile.component_finished(COMPONENT_TYPES[component.type_id], started)
+
+# libyaml's parser is an order of magnitude faster when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def parse_yaml(yaml_text: str) -> Tuple[Any, Optional[yaml.Node]]:
+    """Parse YAML once, returning both the plain data and the node graph.
+
+    The node graph keeps source marks, so tools like the outline panel can map
+    components back to editor lines without parsing the text a second time.
+    Raises yaml.YAMLError on invalid input.
+    """
+    loader = YAML_LOADER(yaml_text)
     try:
-        data = yaml.safe_load(yaml_text)
-        if not data:
-            return """<!DOCTYPE html>
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+    except yaml.YAMLError as e:
+        raise detailed_yaml_error(yaml_text, e) from None
+    finally:
+        loader.dispose()
+    return data, node
+
+def detailed_yaml_error(yaml_text: str, error: yaml.YAMLError) -> yaml.YAMLError:
+    """Return the pure-Python parser's error for text libyaml rejected.
+
+    Its message quotes the offending line with a caret under the problem,
+    which libyaml's does not. Parsing again only happens on the error path.
+    """
+    if YAML_LOADER is yaml.SafeLoader:
+        return error
+    loader = yaml.SafeLoader(yaml_text)
+    try:
+        node = loader.get_single_node()
+        if node is not None:
+            loader.construct_document(node)
+    except yaml.YAMLError as e:
+        return e
+    finally:
+        loader.dispose()
+    return error
+
+def _mapping_value(node: yaml.Node, key: str) -> Optional[yaml.Node]:
+    # Later duplicate keys win, matching what safe_load keeps
+    value = None
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value_node in node.value:
+            if isinstance(key_node, yaml.ScalarNode) and key_node.value == key:
+                value = value_node
+    return value
+
+def _has_items(node: Optional[yaml.Node]) -> bool:
+    # The same rule as ListComponent.build: only a non-empty sequence renders
+    return isinstance(node, yaml.SequenceNode) and bool(node.value)
+
+def _outline_components(sequence: Optional[yaml.Node]) -> List[Dict[str, Any]]:
+    entries = []
+    if not isinstance(sequence, yaml.SequenceNode):
+        return entries
+    for item in sequence.value:
+        type_node = _mapping_value(item, "type")
+        if not isinstance(type_node, yaml.ScalarNode):
+            continue
+        component_type = type_node.value.lower()
+        if component_type not in COMPONENT_TYPES:
+            continue
+        if component_type == "list" and not _has_items(_mapping_value(item, "items")):
+            continue
+        text_node = _mapping_value(item, "text")
+        entries.append({
+            "type": component_type,
+            "text": text_node.value if isinstance(text_node, yaml.ScalarNode) else "",
+            "line": item.start_mark.line,
+            "column": item.start_mark.column,
+            # The line after the component's last, whether or not it ends in a newline
+            "end_line": item.end_mark.line + (1 if item.end_mark.column else 0),
+            "children": _outline_components(_mapping_value(item, "children"))
+                        if component_type in CONTAINER_TYPES else [],
+        })
+    return entries
+
+def build_outline(node: Optional[yaml.Node]) -> List[Dict[str, Any]]:
+    """Return the rendered component tree of a parsed document.
+
+    Only components that produce markup are listed, so the position of an entry
+    among its siblings matches the position of its element in the page.
+    """
+    return _outline_components(_mapping_value(_mapping_value(node, "body"), "children"))
+
+def render_page(data: Any, pretty: bool = False, component_lines: Optional[List[int]] = None,
+                profile: Optional[RenderProfile] = None, source_ids: bool = False) -> str:
+    """Render a parsed document (or its PageTree) to a full HTML page.
+
+    In pretty mode, component_lines (if given) receives the zero-based output
+    line of every rendered component, in the same order as build_outline
+    lists them. A profile, if given, gets "normalize", "render" and
+    "serialize" phases. With source_ids, components are numbered in that
+    same order through data-wf-id attributes (see source_map.SourceMap) and
+    the page gets the script the preview uses to highlight them.
+    """
+    if not data:
+        return """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -514,18 +811,20 @@ def yaml_to_html(yaml_text: str) -> Tuple[str, bool]:
         </script>
     </div>
 </body>
-</html>""", True
+</html>"""
 
-        title = data.get("title", "Untitled Page")
-        body_style = data.get("body", {}).get("style", {})
-        body_text = data.get("body", {}).get("text", "")
-        
-        html_parts = [f"""<!DOCTYPE html>
+    if isinstance(data, PageTree):
+        tree = data
+    else:
+        with phase(profile, "normalize"):
+            tree = build_page_tree(data, profile)
+    
+    html_parts = [f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>{tree.title}</title>
     <style>
         body {{
             margin: 0;
@@ -634,22 +933,117 @@ def yaml_to_html(yaml_text: str) -> Tuple[str, bool]:
         }}
     </style>
 </head>
-<body{style_dict_to_html(body_style)}>"""]
-        
-        if body_text:
-            html_parts.append(f'<div class="body-text">{body_text}</div>')
-        
-        if "body" in data:
-            body = data["body"]
-            if "children" in body:
-                for child in body["children"]:
-                    html_parts.append(render_component(child))
-        
-        html_parts.append("</body>\n</html>")
-        return "\n".join(html_parts), True
+<body{tree.body_style}>"""]
+    
+    if tree.body_text:
+        html_parts.append(f'{INDENT if pretty else ""}<div class="body-text">{tree.body_text}</div>')
+    
+    children = tree.children
+    ids = itertools.count() if source_ids else None
+    with phase(profile, "render"):
+        if pretty:
+            # One shared fragment list for the whole body, so the page is joined
+            # once instead of once per nesting level.
+            starts = [] if component_lines is not None else None
+            for child in children:
+                emit_component(child, 1, html_parts, starts, profile, ids)
+            if starts:
+                component_lines.extend(_fragment_lines(html_parts, starts))
+        else:
+            for child in children:
+                html_parts.append(render_component(child, profile=profile, ids=ids))
+    
+    if source_ids:
+        html_parts.append(SOURCE_MAP_SCRIPT)
+    html_parts.append("</body>\n</html>")
+    with phase(profile, "serialize"):
+        return "\n".join(html_parts)
 
-    except yaml.YAMLError as e:
-        error_html = f"""<!DOCTYPE html>
+# Highlights a component for the editor, scrolls to a point within one and,
+# on Ctrl+click, asks the editor to reveal a component's source. Elements are
+# looked up by position in the document-ordered list of numbered elements,
+# which is their id.
+SOURCE_MAP_SCRIPT = """<style>
+    .wf-highlight {
+        outline: 2px solid #4dabf7;
+        outline-offset: 2px;
+    }
+</style>
+<script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+<script>
+    (function () {
+        var elements = null;
+        var highlighted = null;
+        window.webforgeElement = function (id) {
+            if (elements === null) {
+                elements = document.querySelectorAll('[data-wf-id]');
+            }
+            return id === null ? null : elements[id] || null;
+        };
+        window.webforgeHighlight = function (id) {
+            if (highlighted) {
+                highlighted.classList.remove('wf-highlight');
+            }
+            highlighted = window.webforgeElement(id);
+            if (highlighted) {
+                highlighted.classList.add('wf-highlight');
+            }
+        };
+        // The latest target wins; it is applied once, on the next frame
+        var scrollTarget = null;
+        window.webforgeScrollTo = function (id, fraction) {
+            var scheduled = scrollTarget !== null;
+            scrollTarget = [id, fraction];
+            if (scheduled) {
+                return;
+            }
+            window.requestAnimationFrame(function () {
+                var target = scrollTarget;
+                scrollTarget = null;
+                if (target[0] === null) {
+                    window.scrollTo(window.scrollX, 0);
+                    return;
+                }
+                var element = window.webforgeElement(target[0]);
+                if (element) {
+                    var rect = element.getBoundingClientRect();
+                    window.scrollTo(window.scrollX, window.scrollY + rect.top + rect.height * target[1]);
+                }
+            });
+        };
+        if (typeof QWebChannel === 'undefined' || typeof qt === 'undefined') {
+            return;
+        }
+        new QWebChannel(qt.webChannelTransport, function (channel) {
+            window.webforge = channel.objects.webforge;
+        });
+        document.addEventListener('click', function (event) {
+            if (!(event.ctrlKey || event.metaKey) || !window.webforge) {
+                return;
+            }
+            var element = event.target.closest('[data-wf-id]');
+            if (element) {
+                event.preventDefault();
+                window.webforge.revealSource(parseInt(element.getAttribute('data-wf-id'), 10));
+            }
+        }, true);
+    })();
+</script>"""
+
+def _fragment_lines(fragments: List[str], indices: List[int]) -> List[int]:
+    # Fragments are joined with newlines but may contain newlines themselves
+    lines = []
+    line = 0
+    position = 0
+    for index in indices:
+        for fragment in fragments[position:index]:
+            line += fragment.count("\n") + 1
+        position = index
+        lines.append(line)
+    return lines
+
+def render_error_page(e: yaml.YAMLError) -> str:
+    return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -701,4 +1095,26 @@ def yaml_to_html(yaml_text: str) -> Tuple[str, bool]:
     </div>
 </body>
 </html>"""
-        return error_html, False 
\ No newline at end of file
+
+def yaml_to_html(yaml_text: str, pretty: bool = False,
+                 profile: Optional[RenderProfile] = None) -> Tuple[str, bool]:
+    hooked = render_hooks.start_document(yaml_text, profile)
+    if hooked is not None:
+        profile = hooked
+    try:
+        try:
+            with phase(profile, "parse"):
+                data, _ = parse_yaml(yaml_text)
+        except yaml.YAMLError as e:
+            html, success = render_error_page(e), False
+        else:
+            html, success = render_page(data, pretty, profile=profile), True
+    except BaseException:
+        # Hooks hear about every document they were told started
+        if hooked is not None:
+            hooked.finish(False, "")
+        raise
+    if hooked is not None:
+        hooked.finish(success, html)
+    return html, success
+
@@ -0,0 +1,333 @@
+import argparse
+import difflib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from yaml_converter import (BUTTON_SIZES, BUTTON_STYLES, BUTTON_VARIANTS, COMPONENT_TYPES, LIST_TYPES,
+                            YAML_LOADER, detailed_yaml_error)
+
+NULL_TAG = "tag:yaml.org,2002:null"
+
+class Diagnostic(NamedTuple):
+    """A problem in a document. Lines and columns are zero-based, like YAML marks."""
+    line: int
+    column: int
+    end_line: int
+    end_column: int
+    severity: str
+    message: str
+
+    def shifted(self, lines: int) -> "Diagnostic":
+        return self._replace(line=self.line + lines, end_line=self.end_line + lines)
+
+def _diagnostic(node: yaml.Node, severity: str, message: str) -> Diagnostic:
+    start, end = node.start_mark, node.end_mark
+    if end.line > start.line:
+        # Block collections end where the next token starts; keep to the first line
+        end = start
+    end_column = end.column if end is not start else start.column + 1
+    return Diagnostic(start.line, start.column, end.line, max(end_column, start.column + 1),
+                      severity, message)
+
+def _suggestion(value: str, choices) -> str:
+    matches = difflib.get_close_matches(value, choices, n=1)
+    return f" (did you mean '{matches[0]}'?)" if matches else ""
+
+def _is_null(node: yaml.Node) -> bool:
+    return isinstance(node, yaml.ScalarNode) and node.tag == NULL_TAG
+
+# Field kinds. Each is compiled into a function (value_node, out) -> None.
+SCALAR = "scalar"
+STYLE = "style"
+ITEMS = "items"
+CHILDREN = "children"
+
+class Choice:
+    def __init__(self, values, lower: bool = False):
+        self.values = tuple(values)
+        self.lower = lower
+
+# What each component type reads; anything else is ignored by the renderer
+SCHEMA: Dict[str, Dict[str, object]] = {
+    "header": {"text": SCALAR, "style": STYLE},
+    "paragraph": {"text": SCALAR, "style": STYLE},
+    "image": {"src": SCALAR, "alt": SCALAR, "style": STYLE},
+    "list": {"items": ITEMS, "list-type": Choice(LIST_TYPES, lower=True), "style": STYLE},
+    "button": {"text": SCALAR, "link": SCALAR, "variant": Choice(BUTTON_VARIANTS),
+               "size": Choice(BUTTON_SIZES), "button-style": Choice(BUTTON_STYLES), "style": STYLE},
+    "section": {"text": SCALAR, "style": STYLE, "children": CHILDREN},
+    "div": {"text": SCALAR, "style": STYLE, "children": CHILDREN},
+}
+REQUIRED = {"image": ("src",), "list": ("items",)}
+
+def _check_scalar(name: str):
+    def check(node, out):
+        if not isinstance(node, yaml.ScalarNode):
+            out.append(_diagnostic(node, "error", f"'{name}' must be a single value, not a "
+                                   f"{'list' if isinstance(node, yaml.SequenceNode) else 'mapping'}"))
+    return check
+
+def _check_choice(name: str, choice: Choice):
+    allowed = ", ".join(choice.values)
+    values = frozenset(choice.values)
+    def check(node, out):
+        if not isinstance(node, yaml.ScalarNode):
+            out.append(_diagnostic(node, "error", f"'{name}' must be one of: {allowed}"))
+            return
+        value = node.value.lower() if choice.lower else node.value
+        if value not in values:
+            out.append(_diagnostic(node, "warning", f"unknown {name} '{node.value}'"
+                                   f"{_suggestion(value, choice.values)}; expected one of: {allowed}"))
+    return check
+
+def _check_style(node, out):
+    if _is_null(node):
+        return
+    if not isinstance(node, yaml.MappingNode):
+        out.append(_diagnostic(node, "error", "'style' must be a mapping of CSS properties"))
+        return
+    for key_node, value_node in node.value:
+        if not isinstance(value_node, yaml.ScalarNode):
+            out.append(_diagnostic(value_node, "error",
+                                   f"CSS property '{getattr(key_node, 'value', '?')}' must have a single value"))
+
+def _check_items(node, out):
+    if not isinstance(node, yaml.SequenceNode):
+        out.append(_diagnostic(node, "error", "'items' must be a list"))
+        return
+    if not node.value:
+        out.append(_diagnostic(node, "warning", "list has no items and renders nothing"))
+    for item in node.value:
+        if isinstance(item, yaml.SequenceNode):
+            out.append(_diagnostic(item, "warning", "nested lists are rendered as plain text"))
+
+def _check_children(node, out):
+    if not _is_null(node) and not isinstance(node, yaml.SequenceNode):
+        out.append(_diagnostic(node, "error", "'children' must be a list of components"))
+
+Checker = Callable[[yaml.MappingNode, List[Diagnostic]], Optional[yaml.SequenceNode]]
+
+def compile_schema(schema: Dict[str, Dict[str, object]]) -> Dict[str, Checker]:
+    """Build one checker per component type from a schema description.
+
+    A checker reports problems with a component's own fields and returns its
+    children sequence (if any) so the caller can walk into it.
+    """
+    checkers = {}
+    for component_type, fields in schema.items():
+        field_checks = {"type": None}
+        for name, kind in fields.items():
+            if isinstance(kind, Choice):
+                field_checks[name] = _check_choice(name, kind)
+            elif kind == SCALAR:
+                field_checks[name] = _check_scalar(name)
+            elif kind == STYLE:
+                field_checks[name] = _check_style
+            elif kind == ITEMS:
+                field_checks[name] = _check_items
+            elif kind == CHILDREN:
+                field_checks[name] = _check_children
+        checkers[component_type] = _make_checker(component_type, field_checks,
+                                                 REQUIRED.get(component_type, ()))
+    return checkers
+
+def _make_checker(component_type: str, field_checks: Dict[str, Optional[Callable]],
+                  required: Tuple[str, ...]) -> Checker:
+    names = tuple(field_checks)
+    def check(node, out):
+        children = None
+        seen = set()
+        for key_node, value_node in node.value:
+            name = key_node.value if isinstance(key_node, yaml.ScalarNode) else None
+            seen.add(name)
+            if name not in field_checks:
+                out.append(_diagnostic(key_node, "warning",
+                                       f"{component_type} ignores field '{name}'{_suggestion(str(name), names)}"))
+                continue
+            field_check = field_checks[name]
+            if field_check is not None:
+                field_check(value_node, out)
+            if name == "children" and isinstance(value_node, yaml.SequenceNode):
+                children = value_node
+        for name in required:
+            if name not in seen:
+                out.append(_diagnostic(node, "warning", f"{component_type} without '{name}' renders nothing"
+                                       if component_type == "list" else f"{component_type} has no '{name}'"))
+        return children
+    return check
+
+CHECKERS = compile_schema(SCHEMA)
+
+def _type_of(node: yaml.MappingNode) -> Optional[yaml.Node]:
+    type_node = None
+    for key_node, value_node in node.value:
+        if isinstance(key_node, yaml.ScalarNode) and key_node.value == "type":
+            type_node = value_node
+    return type_node
+
+def syntax_diagnostic(error: yaml.YAMLError) -> Diagnostic:
+    """Describe a YAML parse error as a diagnostic at the position it names."""
+    if isinstance(error, yaml.MarkedYAMLError):
+        mark = error.problem_mark or error.context_mark
+        line, column = (mark.line, mark.column) if mark is not None else (0, 0)
+        return Diagnostic(line, column, line, column + 1, "error", error.problem or str(error))
+    return Diagnostic(0, 0, 0, 1, "error", str(error))
+
+class SchemaValidator:
+    """Validate documents against SCHEMA, reusing results for unchanged components.
+
+    Results are cached per component by its source text and starting column,
+    with lines stored relative to the component, so editing one component
+    only re-checks the components that contain the edit. The cache keeps
+    just the components seen in the previous run. Not thread-safe; give each
+    worker its own validator.
+    """
+
+    def __init__(self):
+        self.cache: Dict[Tuple[str, int], List[Diagnostic]] = {}
+        self.next_cache: Dict[Tuple[str, int], List[Diagnostic]] = {}
+        self.text = ""
+
+    def validate(self, yaml_text: str) -> List[Diagnostic]:
+        try:
+            loader = YAML_LOADER(yaml_text)
+            try:
+                root = loader.get_single_node()
+            except yaml.YAMLError as e:
+                raise detailed_yaml_error(yaml_text, e) from None
+            finally:
+                loader.dispose()
+        except yaml.YAMLError as e:
+            return [syntax_diagnostic(e)]
+
+        self.text = yaml_text
+        self.next_cache = {}
+        out: List[Diagnostic] = []
+        if root is not None:
+            self.check_page(root, out)
+        self.cache = self.next_cache
+        self.next_cache = {}
+        self.text = ""
+        out.sort()
+        return out
+
+    def check_page(self, root: yaml.Node, out: List[Diagnostic]) -> None:
+        if not isinstance(root, yaml.MappingNode):
+            out.append(_diagnostic(root, "error", "a page must be a mapping with 'title' and 'body'"))
+            return
+        body = None
+        for key_node, value_node in root.value:
+            name = key_node.value if isinstance(key_node, yaml.ScalarNode) else None
+            if name == "title":
+                _check_scalar("title")(value_node, out)
+            elif name == "body":
+                body = value_node
+            else:
+                out.append(_diagnostic(key_node, "warning",
+                                       f"unknown top-level key '{name}'{_suggestion(str(name), ('title', 'body'))}"))
+        if body is None or _is_null(body):
+            return
+        if not isinstance(body, yaml.MappingNode):
+            out.append(_diagnostic(body, "error", "'body' must be a mapping"))
+            return
+        for key_node, value_node in body.value:
+            name = key_node.value if isinstance(key_node, yaml.ScalarNode) else None
+            if name == "style":
+                _check_style(value_node, out)
+            elif name == "text":
+                _check_scalar("text")(value_node, out)
+            elif name == "children":
+                _check_children(value_node, out)
+                if isinstance(value_node, yaml.SequenceNode):
+                    for child in value_node.value:
+                        self.check_component(child, out)
+            else:
+                out.append(_diagnostic(key_node, "warning",
+                                       f"body ignores field '{name}'{_suggestion(str(name), ('style', 'text', 'children'))}"))
+
+    def check_component(self, node: yaml.Node, out: List[Diagnostic]) -> None:
+        start = node.start_mark
+        key = (self.text[start.index:node.end_mark.index], start.column)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self.next_cache.get(key)
+        if cached is not None:
+            self.next_cache[key] = cached
+            out.extend(diagnostic.shifted(start.line) for diagnostic in cached)
+            return
+
+        found: List[Diagnostic] = []
+        self.check_fields(node, found)
+        self.next_cache[key] = [diagnostic.shifted(-start.line) for diagnostic in found]
+        out.extend(found)
+
+    def check_fields(self, node: yaml.Node, out: List[Diagnostic]) -> None:
+        if not isinstance(node, yaml.MappingNode):
+            out.append(_diagnostic(node, "error", "a component must be a mapping with a 'type'"))
+            return
+        type_node = _type_of(node)
+        if type_node is None:
+            out.append(_diagnostic(node, "error", "component has no 'type'"))
+            return
+        if not isinstance(type_node, yaml.ScalarNode):
+            out.append(_diagnostic(type_node, "error", "'type' must be a single value"))
+            return
+        component_type = type_node.value.lower()
+        checker = CHECKERS.get(component_type)
+        if checker is None:
+            out.append(_diagnostic(type_node, "error", f"unknown component type '{type_node.value}'"
+                                   f"{_suggestion(component_type, COMPONENT_TYPES)}"))
+            return
+        children = checker(node, out)
+        if children is not None:
+            for child in children.value:
+                self.check_component(child, out)
+
+def validate(yaml_text: str) -> List[Diagnostic]:
+    """Validate a document once, without caching."""
+    return SchemaValidator().validate(yaml_text)
+
+def lint_file(path: str) -> Tuple[str, List[Diagnostic], Optional[str]]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            text = file.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return path, [], str(e)
+    return path, validate(text), None
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="webforge lint",
+                                     description="Check YAML pages against the component schema.")
+    parser.add_argument("files", nargs="+", metavar="FILE")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="files checked in parallel (default: one process per CPU)")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings as well as errors")
+    args = parser.parse_args(argv)
+
+    jobs = min(args.jobs or os.cpu_count() or 1, len(args.files))
+    if jobs == 1:
+        return report(map(lint_file, args.files), args.strict)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(args.files) // (jobs * 4))
+        return report(pool.map(lint_file, args.files, chunksize=chunksize), args.strict)
+
+def report(results, strict: bool) -> int:
+    failed = False
+    for path, diagnostics, error in results:
+        if error is not None:
+            print(f"{path}: error: {error}", file=sys.stderr)
+            failed = True
+            continue
+        for diagnostic in diagnostics:
+            print(f"{path}:{diagnostic.line + 1}:{diagnostic.column + 1}: "
+                  f"{diagnostic.severity}: {diagnostic.message}")
+            if diagnostic.severity == "error" or strict:
+                failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())